@@ -1,411 +1,640 @@
+import argparse
+import hashlib
+import inspect
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import Counter
-import numpy as np
-
-# Set style for better-looking plots
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 10
-
-# Load the data
-print("Loading startup data...")
-with open('startups_data.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
-
-startups = data['startups']
-df = pd.DataFrame(startups)
-
-print(f"Loaded {len(df)} startups")
-
-# Create charts directory
 import os
-os.makedirs('charts', exist_ok=True)
-
-# 1. Top 15 Industries Bar Chart
-print("\n1. Generating industry distribution chart...")
-industries = []
-for startup in startups:
-    if startup.get('industry'):
-        industries.append(startup['industry']['name'])
-
-industry_counts = Counter(industries)
-top_industries = dict(sorted(industry_counts.items(), key=lambda x: x[1], reverse=True)[:15])
-
-plt.figure(figsize=(14, 7))
-bars = plt.bar(range(len(top_industries)), list(top_industries.values()), color='#2E86AB')
-plt.xlabel('Industry', fontsize=12, fontweight='bold')
-plt.ylabel('Number of Startups', fontsize=12, fontweight='bold')
-plt.title('Top 15 Industries in Uzbekistan Startup Ecosystem', fontsize=14, fontweight='bold', pad=20)
-plt.xticks(range(len(top_industries)), list(top_industries.keys()), rotation=45, ha='right')
-plt.tight_layout()
-
-# Add value labels on bars
-for i, (bar, value) in enumerate(zip(bars, top_industries.values())):
-    plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 2, str(value),
-             ha='center', va='bottom', fontweight='bold')
-
-plt.savefig('charts/01_top_industries.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 2. Startup Stage Distribution
-print("2. Generating stage distribution chart...")
-stages_mapping = {
-    'pre_seed': 'Pre-Seed',
-    'seed_': 'Seed',
-    'idea': 'Idea',
-    'early_a': 'Early Stage A',
-    'serias_a': 'Series A',
-    'early_b': 'Early Stage B',
-    'expension': 'Expansion',
-    None: 'Not Specified'
-}
-
-stage_counts = Counter([stages_mapping.get(s.get('stage'), 'Not Specified') for s in startups])
-stage_order = ['Idea', 'Pre-Seed', 'Seed', 'Early Stage A', 'Series A', 'Early Stage B', 'Expansion', 'Not Specified']
-stage_counts_ordered = {k: stage_counts.get(k, 0) for k in stage_order if stage_counts.get(k, 0) > 0}
-
-plt.figure(figsize=(12, 6))
-colors = ['#A23B72', '#F18F01', '#2E86AB', '#06A77D', '#D62246', '#8B5A3C', '#6C4B5E', '#999999']
-bars = plt.bar(range(len(stage_counts_ordered)), list(stage_counts_ordered.values()),
-               color=colors[:len(stage_counts_ordered)])
-plt.xlabel('Funding Stage', fontsize=12, fontweight='bold')
-plt.ylabel('Number of Startups', fontsize=12, fontweight='bold')
-plt.title('Startup Distribution by Funding Stage', fontsize=14, fontweight='bold', pad=20)
-plt.xticks(range(len(stage_counts_ordered)), list(stage_counts_ordered.keys()), rotation=45, ha='right')
-plt.tight_layout()
-
-# Add value labels
-for bar, value in zip(bars, stage_counts_ordered.values()):
-    plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5, str(value),
-             ha='center', va='bottom', fontweight='bold', fontsize=11)
-
-plt.savefig('charts/02_funding_stages.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 3. Regional Distribution (Top 10 Regions)
-print("3. Generating regional distribution chart...")
-regions = []
-for startup in startups:
-    if startup.get('region'):
-        regions.append(startup['region']['name'])
-    else:
-        regions.append('Not Specified')
-
-region_counts = Counter(regions)
-top_regions = dict(sorted(region_counts.items(), key=lambda x: x[1], reverse=True)[:10])
-
-plt.figure(figsize=(12, 7))
-bars = plt.barh(range(len(top_regions)), list(top_regions.values()), color='#06A77D')
-plt.ylabel('Region', fontsize=12, fontweight='bold')
-plt.xlabel('Number of Startups', fontsize=12, fontweight='bold')
-plt.title('Top 10 Regions by Startup Count', fontsize=14, fontweight='bold', pad=20)
-plt.yticks(range(len(top_regions)), list(top_regions.keys()))
-plt.gca().invert_yaxis()
-plt.tight_layout()
-
-# Add value labels
-for i, (bar, value) in enumerate(zip(bars, top_regions.values())):
-    plt.text(bar.get_width() + 5, bar.get_y() + bar.get_height()/2, str(value),
-             ha='left', va='center', fontweight='bold')
-
-plt.savefig('charts/03_regional_distribution.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 4. Industry vs Stage Heatmap (Top 10 Industries)
-print("4. Generating industry-stage heatmap...")
-industry_stage_data = []
-for startup in startups:
-    if startup.get('industry'):
-        industry_stage_data.append({
-            'industry': startup['industry']['name'],
-            'stage': stages_mapping.get(startup.get('stage'), 'Not Specified')
-        })
-
-is_df = pd.DataFrame(industry_stage_data)
-top_10_industries = is_df['industry'].value_counts().head(10).index
-is_filtered = is_df[is_df['industry'].isin(top_10_industries)]
-
-heatmap_data = pd.crosstab(is_filtered['industry'], is_filtered['stage'])
-stage_order_filtered = [s for s in stage_order if s in heatmap_data.columns]
-heatmap_data = heatmap_data[stage_order_filtered]
-
-plt.figure(figsize=(14, 8))
-sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', cbar_kws={'label': 'Number of Startups'})
-plt.xlabel('Funding Stage', fontsize=12, fontweight='bold')
-plt.ylabel('Industry', fontsize=12, fontweight='bold')
-plt.title('Top 10 Industries by Funding Stage', fontsize=14, fontweight='bold', pad=20)
-plt.xticks(rotation=45, ha='right')
-plt.yticks(rotation=0)
-plt.tight_layout()
-plt.savefig('charts/04_industry_stage_heatmap.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 5. Verification and Award Status
-print("5. Generating verification and awards chart...")
-status_data = {
-    'Verified Startups': sum(1 for s in startups if s.get('is_verified')),
-    'Digital Awards\nParticipants': sum(1 for s in startups if s.get('digital_startup_awards_participant')),
-    'Platform Members': sum(1 for s in startups if s.get('is_member')),
-    'Tech Awards\nWinners': sum(1 for s in startups if s.get('tech_awards_winner'))
-}
-
-plt.figure(figsize=(10, 6))
-colors = ['#2E86AB', '#F18F01', '#06A77D', '#D62246']
-bars = plt.bar(range(len(status_data)), list(status_data.values()), color=colors)
-plt.xlabel('Status Category', fontsize=12, fontweight='bold')
-plt.ylabel('Number of Startups', fontsize=12, fontweight='bold')
-plt.title('Startup Verification and Recognition Status', fontsize=14, fontweight='bold', pad=20)
-plt.xticks(range(len(status_data)), list(status_data.keys()))
-plt.tight_layout()
-
-# Add value labels and percentages
-for bar, (key, value) in zip(bars, status_data.items()):
-    percentage = (value / len(startups)) * 100
-    plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5,
-             f'{value}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold')
-
-plt.savefig('charts/05_verification_awards.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 6. Maturity Funnel Analysis
-print("6. Generating maturity funnel chart...")
-funnel_order = ['Idea', 'Pre-Seed', 'Seed', 'Early Stage A', 'Series A', 'Early Stage B', 'Expansion']
-funnel_data = {stage: stage_counts.get(stage, 0) for stage in funnel_order}
-
-plt.figure(figsize=(14, 10))
-y_pos = np.arange(len(funnel_data))
-values = list(funnel_data.values())
-max_val = max(values)
-
-colors_gradient = plt.cm.Blues(np.linspace(0.5, 0.95, len(funnel_data)))
-
-for i, (stage, value) in enumerate(funnel_data.items()):
-    bar_width = (value / max_val) * 0.85
-    left = (1 - bar_width) / 2
-
-    # Create trapezoid effect for funnel
-    bar = plt.barh(i, bar_width, left=left, height=0.8, color=colors_gradient[i],
-                   edgecolor='white', linewidth=2)
-
-    # Add value and percentage inside the bar
-    percentage = (value / len(startups)) * 100
-    # Use black text for better visibility
-    text_color = 'white' if i > 2 else 'navy'
-    plt.text(0.5, i, f'{stage}', ha='center', va='center',
-             fontweight='bold', fontsize=13, color=text_color)
-
-    # Add count and percentage to the right of the bar
-    plt.text(left + bar_width + 0.02, i, f'{value} ({percentage:.1f}%)',
-             ha='left', va='center', fontweight='bold', fontsize=11, color='black')
-
-plt.xlim(0, 1.15)
-plt.ylim(-0.5, len(funnel_data) - 0.5)
-plt.gca().invert_yaxis()  # Invert to show funnel from top to bottom
-plt.axis('off')
-plt.title('Startup Maturity Funnel: From Idea to Expansion',
-          fontsize=16, fontweight='bold', pad=20)
-plt.tight_layout()
-plt.savefig('charts/06_maturity_funnel.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 7. Industry Maturity Analysis (Average stage by industry)
-print("7. Generating industry maturity analysis...")
-stage_numeric = {
-    'Idea': 1,
-    'Pre-Seed': 2,
-    'Seed': 3,
-    'Early Stage A': 4,
-    'Series A': 5,
-    'Early Stage B': 6,
-    'Expansion': 7,
-    'Not Specified': 0
-}
-
-industry_maturity = {}
-for startup in startups:
-    if startup.get('industry') and startup.get('stage'):
-        industry = startup['industry']['name']
-        stage = stages_mapping.get(startup.get('stage'), 'Not Specified')
-        if industry not in industry_maturity:
-            industry_maturity[industry] = []
-        industry_maturity[industry].append(stage_numeric.get(stage, 0))
-
-# Calculate average maturity score for top 12 industries
-industry_avg_maturity = {}
-for industry, stages in industry_maturity.items():
-    if len(stages) >= 10:  # Only industries with at least 10 startups
-        industry_avg_maturity[industry] = sum(stages) / len(stages)
-
-top_mature_industries = dict(sorted(industry_avg_maturity.items(), key=lambda x: x[1], reverse=True)[:12])
-
-plt.figure(figsize=(14, 7))
-bars = plt.barh(range(len(top_mature_industries)), list(top_mature_industries.values()), color='#A23B72')
-plt.ylabel('Industry', fontsize=12, fontweight='bold')
-plt.xlabel('Average Maturity Score', fontsize=12, fontweight='bold')
-plt.title('Industry Maturity Index (Higher = More Mature Startups)', fontsize=14, fontweight='bold', pad=20)
-plt.yticks(range(len(top_mature_industries)), list(top_mature_industries.keys()))
-plt.gca().invert_yaxis()
-plt.tight_layout()
-
-# Add value labels
-for bar, value in zip(bars, top_mature_industries.values()):
-    plt.text(bar.get_width() + 0.05, bar.get_y() + bar.get_height()/2, f'{value:.2f}',
-             ha='left', va='center', fontweight='bold')
-
-plt.savefig('charts/07_industry_maturity.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 8. Comparison: Tech vs Non-Tech Industries
-print("8. Generating tech vs non-tech comparison...")
-tech_industries = [
-    'SaaS', 'AI & ML', 'EdTech', 'FinTech', 'HealthTech & MedTech',
-    'E-commerce & Retail Tech', 'HRTech', 'Cybersecurity', 'Blockchain & Cryptocurrency',
-    'Cloud Computing & Infrastructure', 'Data Analytics & Big Data', 'IoT (Internet of Things)',
-    'DevOps & Development Tools', 'Automation & Robotics'
-]
-
-tech_count = 0
-non_tech_count = 0
-tech_stages = []
-non_tech_stages = []
-
-for startup in startups:
-    if startup.get('industry'):
-        industry_name = startup['industry']['name']
-        stage = stages_mapping.get(startup.get('stage'), 'Not Specified')
-
-        if industry_name in tech_industries:
-            tech_count += 1
-            tech_stages.append(stage_numeric.get(stage, 0))
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from importlib.metadata import version
+from typing import Callable, Dict, List, Optional, Tuple
+
+import instrumentation
+from startup_db import StartupDB, is_database
+from startup_io import load_flat_frame
+
+# The plotting stack dominates startup time; import_plotting() binds these on first use
+plt = None
+sns = None
+np = None
+
+# Chart name -> (render function, description, aggregate keys it reads), in report order
+CHARTS: Dict[str, Tuple[Callable[[Dict, str], None], str, Tuple[str, ...]]] = {}
+
+# Per-directory record of the cache key each PNG was rendered from
+CHART_MANIFEST = '.chart_manifest.json'
+
+# Manifest entry holding, per chart, the input key it was last rendered from
+MANIFEST_INPUTS = '_inputs'
+
+
+def register_chart(name: str, description: str, inputs: Tuple[str, ...] = ()):
+    """
+    Register a render function under its output file name (without .png).
+
+    ``inputs`` lists the aggregate keys the chart reads; together with the
+    function source (colors, figsize, dpi...) they form its cache key.
+    """
+    def decorator(func):
+        CHARTS[name] = (func, description, inputs)
+        return func
+    return decorator
+
+
+def import_plotting():
+    """Import matplotlib (Agg backend), seaborn and numpy into module globals."""
+    global plt, sns, np
+    if plt is not None:
+        return
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import numpy as np
+
+
+def apply_style():
+    """Set style for better-looking plots."""
+    import_plotting()
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+    plt.rcParams['font.size'] = 10
+
+
+@lru_cache(maxsize=None)
+def plotting_versions() -> str:
+    """matplotlib and seaborn versions, looked up once per run (each lookup scans site-packages)."""
+    return f"{version('matplotlib')}|{version('seaborn')}"
+
+
+def _render_digest(name: str):
+    """Hash of how a chart is drawn: library versions and the render and style source."""
+    func, _, _ = CHARTS[name]
+    digest = hashlib.sha256()
+    digest.update(plotting_versions().encode())
+    digest.update(inspect.getsource(apply_style).encode())
+    digest.update(inspect.getsource(func).encode())
+    return digest
+
+
+def chart_cache_key(name: str, agg: Dict) -> str:
+    """
+    Content hash of everything that determines a chart's pixels.
+
+    Covers the chart's input aggregates, the source of its render function
+    and of apply_style (so edits to colors, figsize or dpi invalidate it),
+    and the matplotlib/seaborn versions.
+    """
+    _, _, inputs = CHARTS[name]
+    digest = _render_digest(name)
+    for key in inputs:
+        value = agg[key]
+        if hasattr(value, 'to_json'):
+            payload = value.to_json(orient='split')
+        else:
+            payload = json.dumps(value, ensure_ascii=False)
+        digest.update(f"{key}={payload}".encode())
+    return digest.hexdigest()
+
+
+def input_fingerprint(data_file: str, classification_file: str) -> str:
+    """
+    Cheap hash of the files the aggregates are computed from.
+
+    The data file (and the WAL of a SQLite index, which holds committed
+    pages too) is identified by path, size and modification time rather
+    than read; the classification table is small and hashed by content.
+    """
+    digest = hashlib.sha256()
+    for path in (data_file, data_file + '-wal'):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    with open(classification_file, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def chart_input_key(name: str, fingerprint: str) -> str:
+    """Key of a chart rendered from the inputs behind ``fingerprint``, decidable without loading them."""
+    digest = _render_digest(name)
+    digest.update(fingerprint.encode())
+    return digest.hexdigest()
+
+
+def charts_up_to_date(names: List[str], output_dir: str, fingerprint: str) -> bool:
+    """True when every chart was last rendered from the same inputs and its PNG still exists."""
+    rendered_from = load_manifest(output_dir).get(MANIFEST_INPUTS, {})
+    return all(
+        rendered_from.get(name) == chart_input_key(name, fingerprint)
+        and os.path.exists(os.path.join(output_dir, f"{name}.png"))
+        for name in names
+    )
+
+
+def load_manifest(output_dir: str) -> Dict:
+    """Load the chart name -> cache key manifest of an output directory."""
+    path = os.path.join(output_dir, CHART_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir: str, manifest: Dict):
+    """Write the chart manifest next to the PNGs."""
+    with open(os.path.join(output_dir, CHART_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def render_chart(name: str, agg: Dict, output_dir: str) -> Tuple[str, float, float]:
+    """
+    Render one registered chart into output_dir.
+
+    Returns:
+        Tuple of (chart name, render seconds, growth in MB of the rendering
+        process's peak RSS while rendering)
+    """
+    func, _, _ = CHARTS[name]
+    rss_before = instrumentation.peak_rss_mb()
+    started = time.perf_counter()
+    func(agg, output_dir)
+    return name, time.perf_counter() - started, instrumentation.peak_rss_mb() - rss_before
+
+
+@register_chart('01_top_industries', 'Top 15 industries distribution',
+                inputs=('top_industries',))
+def render_top_industries(agg: Dict, output_dir: str):
+    """Top 15 Industries Bar Chart."""
+    print("1. Generating industry distribution chart...")
+    top_industries = agg['top_industries']
+
+    plt.figure(figsize=(14, 7))
+    bars = plt.bar(range(len(top_industries)), list(top_industries.values()), color='#2E86AB')
+    plt.xlabel('Industry', fontsize=12, fontweight='bold')
+    plt.ylabel('Number of Startups', fontsize=12, fontweight='bold')
+    plt.title('Top 15 Industries in Uzbekistan Startup Ecosystem', fontsize=14, fontweight='bold', pad=20)
+    plt.xticks(range(len(top_industries)), list(top_industries.keys()), rotation=45, ha='right')
+    plt.tight_layout()
+
+    # Add value labels on bars
+    for i, (bar, value) in enumerate(zip(bars, top_industries.values())):
+        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 2, str(value),
+                 ha='center', va='bottom', fontweight='bold')
+
+    plt.savefig(os.path.join(output_dir, '01_top_industries.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('02_funding_stages', 'Startup distribution by funding stage',
+                inputs=('stage_counts_ordered',))
+def render_funding_stages(agg: Dict, output_dir: str):
+    """Startup Stage Distribution."""
+    print("2. Generating stage distribution chart...")
+    stage_counts_ordered = agg['stage_counts_ordered']
+
+    plt.figure(figsize=(12, 6))
+    colors = ['#A23B72', '#F18F01', '#2E86AB', '#06A77D', '#D62246', '#8B5A3C', '#6C4B5E', '#999999']
+    bars = plt.bar(range(len(stage_counts_ordered)), list(stage_counts_ordered.values()),
+                   color=colors[:len(stage_counts_ordered)])
+    plt.xlabel('Funding Stage', fontsize=12, fontweight='bold')
+    plt.ylabel('Number of Startups', fontsize=12, fontweight='bold')
+    plt.title('Startup Distribution by Funding Stage', fontsize=14, fontweight='bold', pad=20)
+    plt.xticks(range(len(stage_counts_ordered)), list(stage_counts_ordered.keys()), rotation=45, ha='right')
+    plt.tight_layout()
+
+    # Add value labels
+    for bar, value in zip(bars, stage_counts_ordered.values()):
+        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5, str(value),
+                 ha='center', va='bottom', fontweight='bold', fontsize=11)
+
+    plt.savefig(os.path.join(output_dir, '02_funding_stages.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('03_regional_distribution', 'Top 10 regions by startup count',
+                inputs=('top_regions',))
+def render_regional_distribution(agg: Dict, output_dir: str):
+    """Regional Distribution (Top 10 Regions)."""
+    print("3. Generating regional distribution chart...")
+    top_regions = agg['top_regions']
+
+    plt.figure(figsize=(12, 7))
+    bars = plt.barh(range(len(top_regions)), list(top_regions.values()), color='#06A77D')
+    plt.ylabel('Region', fontsize=12, fontweight='bold')
+    plt.xlabel('Number of Startups', fontsize=12, fontweight='bold')
+    plt.title('Top 10 Regions by Startup Count', fontsize=14, fontweight='bold', pad=20)
+    plt.yticks(range(len(top_regions)), list(top_regions.keys()))
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+
+    # Add value labels
+    for i, (bar, value) in enumerate(zip(bars, top_regions.values())):
+        plt.text(bar.get_width() + 5, bar.get_y() + bar.get_height()/2, str(value),
+                 ha='left', va='center', fontweight='bold')
+
+    plt.savefig(os.path.join(output_dir, '03_regional_distribution.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('04_industry_stage_heatmap', 'Industry vs funding stage heatmap',
+                inputs=('heatmap_data',))
+def render_industry_stage_heatmap(agg: Dict, output_dir: str):
+    """Industry vs Stage Heatmap (Top 10 Industries)."""
+    print("4. Generating industry-stage heatmap...")
+    heatmap_data = agg['heatmap_data']
+
+    plt.figure(figsize=(14, 8))
+    sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', cbar_kws={'label': 'Number of Startups'})
+    plt.xlabel('Funding Stage', fontsize=12, fontweight='bold')
+    plt.ylabel('Industry', fontsize=12, fontweight='bold')
+    plt.title('Top 10 Industries by Funding Stage', fontsize=14, fontweight='bold', pad=20)
+    plt.xticks(rotation=45, ha='right')
+    plt.yticks(rotation=0)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, '04_industry_stage_heatmap.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('05_verification_awards', 'Verification and recognition status',
+                inputs=('status_data', 'total'))
+def render_verification_awards(agg: Dict, output_dir: str):
+    """Verification and Award Status."""
+    print("5. Generating verification and awards chart...")
+    status_data = agg['status_data']
+
+    plt.figure(figsize=(10, 6))
+    colors = ['#2E86AB', '#F18F01', '#06A77D', '#D62246']
+    bars = plt.bar(range(len(status_data)), list(status_data.values()), color=colors)
+    plt.xlabel('Status Category', fontsize=12, fontweight='bold')
+    plt.ylabel('Number of Startups', fontsize=12, fontweight='bold')
+    plt.title('Startup Verification and Recognition Status', fontsize=14, fontweight='bold', pad=20)
+    plt.xticks(range(len(status_data)), list(status_data.keys()))
+    plt.tight_layout()
+
+    # Add value labels and percentages
+    for bar, (key, value) in zip(bars, status_data.items()):
+        percentage = (value / agg['total']) * 100
+        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5,
+                 f'{value}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold')
+
+    plt.savefig(os.path.join(output_dir, '05_verification_awards.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('06_maturity_funnel', 'Startup maturity funnel analysis',
+                inputs=('funnel_data', 'total'))
+def render_maturity_funnel(agg: Dict, output_dir: str):
+    """Maturity Funnel Analysis."""
+    print("6. Generating maturity funnel chart...")
+    funnel_data = agg['funnel_data']
+
+    plt.figure(figsize=(14, 10))
+    y_pos = np.arange(len(funnel_data))
+    values = list(funnel_data.values())
+    max_val = max(values)
+
+    colors_gradient = plt.cm.Blues(np.linspace(0.5, 0.95, len(funnel_data)))
+
+    for i, (stage, value) in enumerate(funnel_data.items()):
+        bar_width = (value / max_val) * 0.85
+        left = (1 - bar_width) / 2
+
+        # Create trapezoid effect for funnel
+        bar = plt.barh(i, bar_width, left=left, height=0.8, color=colors_gradient[i],
+                       edgecolor='white', linewidth=2)
+
+        # Add value and percentage inside the bar
+        percentage = (value / agg['total']) * 100
+        # Use black text for better visibility
+        text_color = 'white' if i > 2 else 'navy'
+        plt.text(0.5, i, f'{stage}', ha='center', va='center',
+                 fontweight='bold', fontsize=13, color=text_color)
+
+        # Add count and percentage to the right of the bar
+        plt.text(left + bar_width + 0.02, i, f'{value} ({percentage:.1f}%)',
+                 ha='left', va='center', fontweight='bold', fontsize=11, color='black')
+
+    plt.xlim(0, 1.15)
+    plt.ylim(-0.5, len(funnel_data) - 0.5)
+    plt.gca().invert_yaxis()  # Invert to show funnel from top to bottom
+    plt.axis('off')
+    plt.title('Startup Maturity Funnel: From Idea to Expansion',
+              fontsize=16, fontweight='bold', pad=20)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, '06_maturity_funnel.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('07_industry_maturity', 'Industry maturity index',
+                inputs=('top_mature_industries',))
+def render_industry_maturity(agg: Dict, output_dir: str):
+    """Industry Maturity Analysis (Average stage by industry)."""
+    print("7. Generating industry maturity analysis...")
+    top_mature_industries = agg['top_mature_industries']
+
+    plt.figure(figsize=(14, 7))
+    bars = plt.barh(range(len(top_mature_industries)), list(top_mature_industries.values()), color='#A23B72')
+    plt.ylabel('Industry', fontsize=12, fontweight='bold')
+    plt.xlabel('Average Maturity Score', fontsize=12, fontweight='bold')
+    plt.title('Industry Maturity Index (Higher = More Mature Startups)', fontsize=14, fontweight='bold', pad=20)
+    plt.yticks(range(len(top_mature_industries)), list(top_mature_industries.keys()))
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+
+    # Add value labels
+    for bar, value in zip(bars, top_mature_industries.values()):
+        plt.text(bar.get_width() + 0.05, bar.get_y() + bar.get_height()/2, f'{value:.2f}',
+                 ha='left', va='center', fontweight='bold')
+
+    plt.savefig(os.path.join(output_dir, '07_industry_maturity.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('08_tech_vs_nontech', 'Tech vs non-tech industries comparison',
+                inputs=('tech_count', 'non_tech_count', 'avg_tech_maturity', 'avg_non_tech_maturity'))
+def render_tech_vs_nontech(agg: Dict, output_dir: str):
+    """Comparison: Tech vs Non-Tech Industries."""
+    print("8. Generating tech vs non-tech comparison...")
+    tech_count = agg['tech_count']
+    non_tech_count = agg['non_tech_count']
+    avg_tech_maturity = agg['avg_tech_maturity']
+    avg_non_tech_maturity = agg['avg_non_tech_maturity']
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    # Count comparison
+    ax1.bar(['Tech\nIndustries', 'Non-Tech\nIndustries'], [tech_count, non_tech_count],
+            color=['#2E86AB', '#F18F01'], width=0.6)
+    ax1.set_ylabel('Number of Startups', fontsize=12, fontweight='bold')
+    ax1.set_title('Startup Count: Tech vs Non-Tech', fontsize=12, fontweight='bold')
+    for i, v in enumerate([tech_count, non_tech_count]):
+        percentage = (v / (tech_count + non_tech_count)) * 100
+        ax1.text(i, v + 10, f'{v}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold')
+
+    # Maturity comparison
+    ax2.bar(['Tech\nIndustries', 'Non-Tech\nIndustries'], [avg_tech_maturity, avg_non_tech_maturity],
+            color=['#2E86AB', '#F18F01'], width=0.6)
+    ax2.set_ylabel('Average Maturity Score', fontsize=12, fontweight='bold')
+    ax2.set_title('Average Maturity: Tech vs Non-Tech', fontsize=12, fontweight='bold')
+    for i, v in enumerate([avg_tech_maturity, avg_non_tech_maturity]):
+        ax2.text(i, v + 0.05, f'{v:.2f}', ha='center', va='bottom', fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, '08_tech_vs_nontech.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('09_early_vs_growth', 'Early stage vs growth stage by industry',
+                inputs=('early_vs_growth',))
+def render_early_vs_growth(agg: Dict, output_dir: str):
+    """Early Stage vs Growth Stage Distribution."""
+    print("9. Generating early vs growth stage analysis...")
+    early_vs_growth = agg['early_vs_growth']
+    industries_list = list(early_vs_growth)
+    early_counts = [split['early'] for split in early_vs_growth.values()]
+    growth_counts = [split['growth'] for split in early_vs_growth.values()]
+
+    x = np.arange(len(industries_list))
+    width = 0.35
+
+    fig, ax = plt.subplots(figsize=(14, 7))
+    bars1 = ax.barh(x - width/2, early_counts, width, label='Early Stage (Idea, Pre-Seed, Seed)', color='#A8DADC')
+    bars2 = ax.barh(x + width/2, growth_counts, width, label='Growth Stage (Early A, Series A+)', color='#E63946')
+
+    ax.set_xlabel('Number of Startups', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Industry', fontsize=12, fontweight='bold')
+    ax.set_title('Top 10 Industries: Early Stage vs Growth Stage Startups', fontsize=14, fontweight='bold', pad=20)
+    ax.set_yticks(x)
+    ax.set_yticklabels(industries_list)
+    ax.legend(loc='lower right', fontsize=10)
+    ax.invert_yaxis()
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, '09_early_vs_growth.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@register_chart('10_key_metrics', 'Key ecosystem metrics overview',
+                inputs=('key_metrics',))
+def render_key_metrics(agg: Dict, output_dir: str):
+    """Summary Statistics Visualization."""
+    print("10. Generating key metrics summary...")
+    key_metrics = agg['key_metrics']
+
+    fig, ax = plt.subplots(figsize=(14, 6))
+    colors_palette = ['#2E86AB', '#F18F01', '#06A77D', '#D62246', '#A23B72', '#8B5A3C']
+    bars = ax.bar(range(len(key_metrics)), list(key_metrics.values()), color=colors_palette)
+
+    ax.set_ylabel('Count', fontsize=12, fontweight='bold')
+    ax.set_title('Uzbekistan Startup Ecosystem: Key Metrics Overview', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(range(len(key_metrics)))
+    ax.set_xticklabels(list(key_metrics.keys()), fontsize=11)
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar, value in zip(bars, key_metrics.values()):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 10, str(value),
+                ha='center', va='bottom', fontweight='bold', fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, '10_key_metrics.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def render_charts(
+    names: List[str],
+    agg: Dict,
+    output_dir: str = 'charts',
+    jobs: Optional[int] = None,
+    force: bool = False,
+    fingerprint: Optional[str] = None
+) -> List[str]:
+    """
+    Render the given charts, in parallel across a process pool when jobs > 1.
+
+    Every chart is independent and only reads the precomputed aggregates,
+    so rasterization can use all cores. Charts whose cache key matches the
+    manifest and whose PNG still exists are skipped unless ``force`` is set.
+
+    With the ``input_fingerprint`` the aggregates came from, the manifest
+    also records it, so ``charts_up_to_date`` can skip the next run before
+    anything is loaded.
+
+    Returns:
+        Names of the charts that were actually rendered
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    rendered_from = manifest.setdefault(MANIFEST_INPUTS, {})
+    for name in names:
+        if fingerprint is None:
+            rendered_from.pop(name, None)
         else:
-            non_tech_count += 1
-            non_tech_stages.append(stage_numeric.get(stage, 0))
-
-comparison_data = {
-    'Category': ['Tech Industries', 'Tech Industries', 'Non-Tech Industries', 'Non-Tech Industries'],
-    'Metric': ['Count', 'Avg Maturity', 'Count', 'Avg Maturity'],
-    'Value': [
-        tech_count,
-        sum(tech_stages) / len(tech_stages) if tech_stages else 0,
-        non_tech_count,
-        sum(non_tech_stages) / len(non_tech_stages) if non_tech_stages else 0
+            rendered_from[name] = chart_input_key(name, fingerprint)
+    with instrumentation.phase('chart_cache_keys'):
+        keys = {name: chart_cache_key(name, agg) for name in names}
+    stale = [
+        name for name in names
+        if force or manifest.get(name) != keys[name]
+        or not os.path.exists(os.path.join(output_dir, f"{name}.png"))
     ]
-}
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-# Count comparison
-ax1.bar(['Tech\nIndustries', 'Non-Tech\nIndustries'], [tech_count, non_tech_count],
-        color=['#2E86AB', '#F18F01'], width=0.6)
-ax1.set_ylabel('Number of Startups', fontsize=12, fontweight='bold')
-ax1.set_title('Startup Count: Tech vs Non-Tech', fontsize=12, fontweight='bold')
-for i, v in enumerate([tech_count, non_tech_count]):
-    percentage = (v / (tech_count + non_tech_count)) * 100
-    ax1.text(i, v + 10, f'{v}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold')
-
-# Maturity comparison
-avg_tech_maturity = sum(tech_stages) / len(tech_stages) if tech_stages else 0
-avg_non_tech_maturity = sum(non_tech_stages) / len(non_tech_stages) if non_tech_stages else 0
-ax2.bar(['Tech\nIndustries', 'Non-Tech\nIndustries'], [avg_tech_maturity, avg_non_tech_maturity],
-        color=['#2E86AB', '#F18F01'], width=0.6)
-ax2.set_ylabel('Average Maturity Score', fontsize=12, fontweight='bold')
-ax2.set_title('Average Maturity: Tech vs Non-Tech', fontsize=12, fontweight='bold')
-for i, v in enumerate([avg_tech_maturity, avg_non_tech_maturity]):
-    ax2.text(i, v + 0.05, f'{v:.2f}', ha='center', va='bottom', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/08_tech_vs_nontech.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 9. Early Stage vs Growth Stage Distribution
-print("9. Generating early vs growth stage analysis...")
-early_stage = ['Idea', 'Pre-Seed', 'Seed']
-growth_stage = ['Early Stage A', 'Series A', 'Early Stage B', 'Expansion']
-
-industry_stage_split = {}
-for startup in startups:
-    if startup.get('industry'):
-        industry = startup['industry']['name']
-        stage = stages_mapping.get(startup.get('stage'), 'Not Specified')
-
-        if industry not in industry_stage_split:
-            industry_stage_split[industry] = {'early': 0, 'growth': 0}
-
-        if stage in early_stage:
-            industry_stage_split[industry]['early'] += 1
-        elif stage in growth_stage:
-            industry_stage_split[industry]['growth'] += 1
-
-# Get top 10 industries with most growth stage startups
-growth_sorted = sorted(industry_stage_split.items(), key=lambda x: x[1]['growth'], reverse=True)[:10]
-
-industries_list = [item[0] for item in growth_sorted]
-early_counts = [item[1]['early'] for item in growth_sorted]
-growth_counts = [item[1]['growth'] for item in growth_sorted]
-
-x = np.arange(len(industries_list))
-width = 0.35
-
-fig, ax = plt.subplots(figsize=(14, 7))
-bars1 = ax.barh(x - width/2, early_counts, width, label='Early Stage (Idea, Pre-Seed, Seed)', color='#A8DADC')
-bars2 = ax.barh(x + width/2, growth_counts, width, label='Growth Stage (Early A, Series A+)', color='#E63946')
-
-ax.set_xlabel('Number of Startups', fontsize=12, fontweight='bold')
-ax.set_ylabel('Industry', fontsize=12, fontweight='bold')
-ax.set_title('Top 10 Industries: Early Stage vs Growth Stage Startups', fontsize=14, fontweight='bold', pad=20)
-ax.set_yticks(x)
-ax.set_yticklabels(industries_list)
-ax.legend(loc='lower right', fontsize=10)
-ax.invert_yaxis()
-
-plt.tight_layout()
-plt.savefig('charts/09_early_vs_growth.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 10. Summary Statistics Visualization
-print("10. Generating key metrics summary...")
-key_metrics = {
-    'Total Startups': len(startups),
-    'Active Industries': len(set(s['industry']['name'] for s in startups if s.get('industry'))),
-    'Covered Regions': len(set(s['region']['name'] for s in startups if s.get('region'))),
-    'Growth Stage\nStartups': sum(1 for s in startups if stages_mapping.get(s.get('stage')) in growth_stage),
-    'Tech Startups': tech_count,
-    'Platform\nMembers': status_data['Platform Members']
-}
-
-fig, ax = plt.subplots(figsize=(14, 6))
-colors_palette = ['#2E86AB', '#F18F01', '#06A77D', '#D62246', '#A23B72', '#8B5A3C']
-bars = ax.bar(range(len(key_metrics)), list(key_metrics.values()), color=colors_palette)
-
-ax.set_ylabel('Count', fontsize=12, fontweight='bold')
-ax.set_title('Uzbekistan Startup Ecosystem: Key Metrics Overview', fontsize=14, fontweight='bold', pad=20)
-ax.set_xticks(range(len(key_metrics)))
-ax.set_xticklabels(list(key_metrics.keys()), fontsize=11)
-ax.grid(axis='y', alpha=0.3)
-
-for bar, value in zip(bars, key_metrics.values()):
-    ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 10, str(value),
-            ha='center', va='bottom', fontweight='bold', fontsize=12)
-
-plt.tight_layout()
-plt.savefig('charts/10_key_metrics.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-print("\n" + "="*60)
-print("All charts generated successfully in the 'charts' directory!")
-print("="*60)
-print("\nGenerated charts:")
-print("1. 01_top_industries.png - Top 15 industries distribution")
-print("2. 02_funding_stages.png - Startup distribution by funding stage")
-print("3. 03_regional_distribution.png - Top 10 regions by startup count")
-print("4. 04_industry_stage_heatmap.png - Industry vs funding stage heatmap")
-print("5. 05_verification_awards.png - Verification and recognition status")
-print("6. 06_maturity_funnel.png - Startup maturity funnel analysis")
-print("7. 07_industry_maturity.png - Industry maturity index")
-print("8. 08_tech_vs_nontech.png - Tech vs non-tech industries comparison")
-print("9. 09_early_vs_growth.png - Early stage vs growth stage by industry")
-print("10. 10_key_metrics.png - Key ecosystem metrics overview")
-print("="*60)
+    for name in names:
+        if name not in stale:
+            print(f"{name} is up to date, skipping.")
+    if not stale:
+        save_manifest(output_dir, manifest)
+        return []
+
+    report = instrumentation.current()
+    jobs = min(jobs or os.cpu_count() or 1, len(stale))
+    if jobs <= 1:
+        apply_style()
+        for name in stale:
+            name, seconds, rss_growth_mb = render_chart(name, agg, output_dir)
+            report.record_phase(f'render.{name}', seconds, rss_growth_mb)
+            manifest[name] = keys[name]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=apply_style) as executor:
+            futures = [executor.submit(render_chart, name, agg, output_dir) for name in stale]
+            for future in as_completed(futures):
+                name, seconds, rss_growth_mb = future.result()
+                report.record_phase(f'render.{name}', seconds, rss_growth_mb)
+                manifest[name] = keys[name]
+
+    save_manifest(output_dir, manifest)
+    return stale
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the report."""
+    parser = argparse.ArgumentParser(description="Generate the Uzbekistan startup ecosystem charts")
+    parser.add_argument('data_file', nargs='?', default='startups_data.json',
+                        help="startups_data.json, a .jsonl/.jsonl.gz/.jsonl.zst stream, a .parquet export "
+                             "or a .db SQLite index")
+    parser.add_argument('--charts', nargs='+', choices=list(CHARTS), metavar='NAME',
+                        help="Only render these charts (default: all)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Render in parallel with this many processes (default: CPU count)")
+    parser.add_argument('--output-dir', default='charts', help="Directory for the PNG files")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-render charts even when their cache key is unchanged")
+    parser.add_argument('--summary', action='store_true',
+                        help="Print the key metrics without loading the plotting stack")
+    parser.add_argument('--summary-json', metavar='PATH',
+                        help="Write every computed statistic as JSON ('-' for stdout) and skip rendering")
+    parser.add_argument('--update-readme', metavar='README', nargs='?', const='README.md',
+                        help="With --summary-json, also regenerate the marked README tables")
+    parser.add_argument('--classification', metavar='PATH', default=None,
+                        help="Classification table with stage labels and scores, tech industries and custom "
+                             "segments (default: classification.json)")
+    parser.add_argument('--report', metavar='PATH',
+                        help="Write a JSON run report with per-phase timings and memory")
+    parser.add_argument('--prometheus', metavar='PATH',
+                        help="Also write the run report as a Prometheus textfile")
+    parser.add_argument('--list', action='store_true', help="List available charts and exit")
+    args = parser.parse_args(argv)
+    if args.update_readme and not args.summary_json:
+        parser.error("--update-readme requires --summary-json")
+    return args
+
+
+def main(argv=None):
+    """Load the data, compute aggregates and render the selected charts."""
+    args = parse_args(argv)
+    report = instrumentation.start_run('analyze_ecosystem')
+    try:
+        _run(args)
+    finally:
+        if args.report:
+            report.write_json(args.report)
+        if args.prometheus:
+            report.write_prometheus(args.prometheus)
+
+
+def _run(args: argparse.Namespace):
+    """Execute the report according to the parsed options."""
+    if args.list:
+        for name, (_, description, _) in CHARTS.items():
+            print(f"{name} - {description}")
+        return
+
+    names = args.charts or list(CHARTS)
+    names = [name for name in CHARTS if name in names]
+
+    from classification import DEFAULT_CLASSIFICATION, load_classification
+
+    classification_file = args.classification or DEFAULT_CLASSIFICATION
+    classification = load_classification(classification_file)
+
+    fingerprint = None
+    if not (args.summary or args.summary_json):
+        # A rerun on unchanged inputs is decided from file metadata, before pandas is imported
+        with instrumentation.phase('input_check'):
+            fingerprint = input_fingerprint(args.data_file, classification_file)
+            up_to_date = not args.force and charts_up_to_date(names, args.output_dir, fingerprint)
+        if up_to_date:
+            print(f"Inputs unchanged since the last run; charts in '{args.output_dir}' are up to date "
+                  f"({len(names)} checked).")
+            return
+
+    from ecosystem_aggregates import AGGREGATE_COLUMNS, compute_aggregates, to_summary
+
+    # Progress goes to stderr when the JSON summary is written to stdout
+    log = sys.stderr if args.summary_json == '-' else sys.stdout
+
+    # Load the data (startups_data.json, a streamed .jsonl/.jsonl.gz/.jsonl.zst file, .parquet,
+    # or a SQLite index, which is grouped in the database before it reaches pandas)
+    print(f"Loading startup data from {args.data_file}...", file=log)
+    with instrumentation.phase('load'):
+        if is_database(args.data_file):
+            with StartupDB(args.data_file) as db:
+                df = db.aggregate_frame()
+            print(f"Loaded {int(df['count'].sum())} startups ({len(df)} groups)", file=log)
+        else:
+            df = load_flat_frame(args.data_file, AGGREGATE_COLUMNS)
+            print(f"Loaded {len(df)} startups", file=log)
+
+    # Every chart renders from these precomputed aggregates
+    print("Computing aggregates...", file=log)
+    with instrumentation.phase('aggregate'):
+        agg = compute_aggregates(df, classification)
+
+    if args.summary_json:
+        summary = to_summary(agg)
+        if args.summary_json == '-':
+            json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+            print()
+        else:
+            with open(args.summary_json, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+            print(f"Summary saved to {args.summary_json}")
+        if args.update_readme:
+            from readme_tables import update_readme
+            update_readme(summary, args.update_readme)
+        return
+
+    if args.summary:
+        print("\nKey metrics:")
+        for label, value in agg['key_metrics'].items():
+            label = label.replace('\n', ' ')
+            print(f"  {label}: {value}")
+        return
+
+    print()
+    with instrumentation.phase('render'):
+        rendered = render_charts(names, agg, args.output_dir, args.jobs, force=args.force,
+                                 fingerprint=fingerprint)
+
+    print("\n" + "="*60)
+    print(f"All charts are up to date in the '{args.output_dir}' directory!")
+    print("="*60)
+    print(f"\nGenerated charts ({len(rendered)} rendered, {len(names) - len(rendered)} unchanged):")
+    for i, name in enumerate(names, 1):
+        status = "" if name in rendered else " (unchanged)"
+        print(f"{i}. {name}.png - {CHARTS[name][1]}{status}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+PHASES = ('load', 'aggregate', 'export_csv', 'export_json', 'render')
+
+
+def run_phase(phase: str, data_file: str, workdir: str) -> Dict:
+    """
+    Run one phase in the current process and measure it.
+
+    Inputs the phase depends on (e.g. the loaded frame for ``aggregate``)
+    are prepared first and excluded from the timing. Memory is reported as
+    the process peak RSS and its growth during the phase.
+    """
+    from instrumentation import peak_rss_mb
+    from startup_io import iter_startups, load_flat_frame
+    from ecosystem_aggregates import AGGREGATE_COLUMNS, compute_aggregates
+
+    # Setup, not timed
+    if phase == 'aggregate':
+        df = load_flat_frame(data_file, AGGREGATE_COLUMNS)
+    elif phase in ('export_csv', 'export_json'):
+        from scrape_startups import save_to_csv, save_to_json
+        startups = list(iter_startups(data_file))
+    elif phase == 'render':
+        import analyze_ecosystem
+        agg = compute_aggregates(load_flat_frame(data_file, AGGREGATE_COLUMNS))
+        analyze_ecosystem.import_plotting()
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    if phase == 'load':
+        load_flat_frame(data_file, AGGREGATE_COLUMNS)
+    elif phase == 'aggregate':
+        compute_aggregates(df)
+    elif phase == 'export_csv':
+        save_to_csv(startups, os.path.join(workdir, 'startups_data.csv'))
+    elif phase == 'export_json':
+        save_to_json(startups, os.path.join(workdir, 'startups_data.json'))
+    elif phase == 'render':
+        analyze_ecosystem.render_charts(list(analyze_ecosystem.CHARTS), agg,
+                                        os.path.join(workdir, 'charts'), jobs=1, force=True)
+    seconds = time.perf_counter() - started
+    rss_after = peak_rss_mb()
+
+    return {'seconds': seconds, 'peak_rss_mb': rss_after, 'phase_rss_growth_mb': rss_after - rss_before}
+
+
+def measure_phase(phase: str, data_file: str, workdir: str) -> Dict:
+    """Run a phase in a fresh interpreter so memory peaks don't leak between phases."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-phase', phase, '--data-file', data_file,
+         '--workdir', workdir],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_crawl(records: int, latency: float, workers: int, max_page_size: int) -> Dict:
+    """
+    Crawl a local stub API end to end and report throughput.
+
+    The crawl negotiates its page size; a second crawl at the browser's
+    page size is timed too, so the requests and wall-clock the negotiation
+    saves are measured rather than estimated.
+    """
+    import contextlib
+    import io
+    from benchmarks.stub_api import StubStartupAPI
+    from benchmarks.synthetic_data import generate_startups
+    from scrape_startups import BROWSER_PAGE_SIZE, scrape_startupbase_api
+
+    def crawl(limit):
+        with StubStartupAPI(startups, latency=latency, max_page_size=max_page_size) as api:
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                crawled = scrape_startupbase_api(api.base_url, limit=limit, delay=0, workers=workers, max_rps=0)
+            return len(crawled), api.requests_served, time.perf_counter() - started
+
+    startups = list(generate_startups(records))
+    crawled, requests_served, seconds = crawl(None)
+    _, baseline_requests, baseline_seconds = crawl(BROWSER_PAGE_SIZE)
+    return {
+        'records': crawled,
+        'requests': requests_served,
+        'seconds': seconds,
+        'records_per_second': crawled / seconds if seconds else 0.0,
+        'baseline_limit': BROWSER_PAGE_SIZE,
+        'baseline_requests': baseline_requests,
+        'baseline_seconds': baseline_seconds,
+        'requests_saved': baseline_requests - requests_served,
+        'seconds_saved': baseline_seconds - seconds,
+    }
+
+
+def run_benchmarks(sizes: List[int], phases: List[str], crawl: Dict) -> Dict:
+    """Generate each dataset size, measure every phase and the crawl."""
+    from benchmarks.synthetic_data import write_dataset
+
+    report = {'datasets': {}, 'crawl': None}
+    with tempfile.TemporaryDirectory(prefix='startupbase-bench-') as workdir:
+        for size in sizes:
+            data_file = os.path.join(workdir, f'startups_{size}.jsonl')
+            write_dataset(data_file, size)
+            report['datasets'][size] = {}
+            for phase in phases:
+                stats = measure_phase(phase, data_file, workdir)
+                report['datasets'][size][phase] = stats
+                print(f"  {size:>9,} records | {phase:<12} | {stats['seconds']:8.3f} s | "
+                      f"peak {stats['peak_rss_mb']:8.1f} MB | +{stats['phase_rss_growth_mb']:7.1f} MB")
+            os.remove(data_file)
+
+    if crawl['records']:
+        stats = measure_crawl(**crawl)
+        report['crawl'] = stats
+        print(f"\n  crawl: {stats['records']:,} records in {stats['requests']} requests, "
+              f"{stats['seconds']:.2f} s ({stats['records_per_second']:,.0f} records/s)")
+        print(f"  limit={stats['baseline_limit']}: {stats['baseline_requests']} requests, "
+              f"{stats['baseline_seconds']:.2f} s (negotiation saved {stats['requests_saved']} requests, "
+              f"{stats['seconds_saved']:.2f} s)")
+    return report
+
+
+def main(argv=None):
+    """Run the scale benchmark suite."""
+    parser = argparse.ArgumentParser(description="Time and memory-profile the scraper and analysis at scale")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Synthetic dataset sizes (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument('--phases', nargs='+', choices=PHASES, default=list(PHASES))
+    parser.add_argument('--crawl-records', type=int, default=5000,
+                        help="Records served by the stub API for the crawl benchmark (0 to skip)")
+    parser.add_argument('--crawl-latency', type=float, default=0.02, help="Stub API latency per request")
+    parser.add_argument('--crawl-workers', type=int, default=4)
+    parser.add_argument('--crawl-max-page-size', type=int, default=100)
+    parser.add_argument('--json', metavar='PATH', help="Also write the report as JSON")
+    # Internal: run a single phase in this process (used for per-phase memory isolation)
+    parser.add_argument('--run-phase', choices=PHASES, help=argparse.SUPPRESS)
+    parser.add_argument('--data-file', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_phase:
+        import contextlib
+        import io
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_phase(args.run_phase, args.data_file, args.workdir)
+        print(json.dumps(stats))
+        return
+
+    print("=" * 60)
+    print("StartupBase scale benchmark")
+    print("=" * 60)
+    report = run_benchmarks(args.sizes, args.phases, {
+        'records': args.crawl_records,
+        'latency': args.crawl_latency,
+        'workers': args.crawl_workers,
+        'max_page_size': args.crawl_max_page_size,
+    })
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_data import WORDS, generate_startups
+from startup_db import StartupDB
+
+# Interactive latency target for a single search of any kind, in milliseconds
+TARGET_MS = 10.0
+
+
+def build_index(filename: str, count: int, batch_size: int = 5000) -> float:
+    """Upsert ``count`` synthetic startups page by page; returns seconds taken."""
+    started = time.perf_counter()
+    with StartupDB(filename) as db:
+        batch = []
+        for startup in generate_startups(count):
+            batch.append(startup)
+            if len(batch) >= batch_size:
+                db.upsert(batch)
+                batch = []
+        if batch:
+            db.upsert(batch)
+    return time.perf_counter() - started
+
+
+def sample_queries(n: int, seed: int = 7) -> List[Tuple[str, Dict]]:
+    """
+    Build ``n`` searches of each kind, as (kind, search keyword arguments).
+
+    Synthetic names are two capitalized vocabulary words glued together
+    (e.g. ``SmartPayments``), so a lowercased compound is a selective term
+    like a real product name. Single vocabulary words appear in almost
+    every synthetic description, which makes them the worst case for
+    ranking and prefix expansion.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        compound = (rng.choice(WORDS) + rng.choice(WORDS)).lower()
+        common = rng.choice(WORDS).lower()
+        queries.append(('name', {'text': compound}))
+        queries.append(('name + filters', {'text': compound, 'region': 'Tashkent', 'stage': 'seed_'}))
+        queries.append(('name prefix', {'text': compound[:len(compound) - 2] + '*'}))
+        queries.append(('common word', {'text': common}))
+        queries.append(('common word + filters', {'text': common, 'industry': 'HealthTech & MedTech',
+                                                  'region': 'Tashkent', 'stage': 'seed_'}))
+        queries.append(('name + common word', {'text': f"{compound} {common}"}))
+        queries.append(('common prefix', {'text': common[:4] + '*'}))
+    return queries
+
+
+def run(count: int, queries: int, keep: str = None) -> bool:
+    """
+    Build (or reuse) an index and time each kind of search against it.
+
+    Returns:
+        True when every kind of search meets ``TARGET_MS`` at p95
+    """
+    print("=" * 60)
+    print(f"Full-text search benchmark ({count:,} synthetic startups)")
+    print("=" * 60)
+
+    timings: Dict[str, List[float]] = {}
+    found: Dict[str, int] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        filename = keep or os.path.join(workdir, 'search.db')
+        if not os.path.exists(filename):
+            seconds = build_index(filename, count)
+            print(f"  Indexed in {seconds:.1f}s ({count / seconds:,.0f} startups/s), "
+                  f"{os.path.getsize(filename) / 1e6:.0f} MB on disk")
+
+        with StartupDB(filename) as db:
+            for kind, query in sample_queries(queries):
+                started = time.perf_counter()
+                results = db.search(limit=20, **query)
+                timings.setdefault(kind, []).append((time.perf_counter() - started) * 1000.0)
+                found[kind] = found.get(kind, 0) + bool(results)
+
+    ok = True
+    print(f"\n  {'query kind':<24}{'p50 ms':>10}{'p95 ms':>10}{'found':>8}")
+    for kind, values in timings.items():
+        values.sort()
+        p95 = values[max(int(len(values) * 0.95) - 1, 0)]
+        ok = ok and p95 <= TARGET_MS
+        share = f"{found[kind] / len(values):.0%}"
+        status = "OK" if p95 <= TARGET_MS else "SLOW"
+        print(f"  {kind:<24}{statistics.median(values):>10.2f}{p95:>10.2f}{share:>8}  {status}")
+    print(f"\n  Target: p95 under {TARGET_MS:.0f} ms for every query kind")
+    return ok
+
+
+def main(argv=None):
+    """Run the benchmark and exit non-zero when searches are too slow."""
+    parser = argparse.ArgumentParser(description="Measure full-text search latency on a synthetic corpus")
+    parser.add_argument('--count', type=int, default=1000000, help="Number of synthetic startups")
+    parser.add_argument('--queries', type=int, default=50, help="Number of searches of each kind")
+    parser.add_argument('--keep', metavar='PATH',
+                        help="Build the index at this path (or reuse it if it exists) instead of a temp file")
+    args = parser.parse_args(argv)
+    if not run(args.count, args.queries, args.keep):
+        print("\nSearch latency target missed.")
+        sys.exit(1)
+    print("\nSearch latency target met.")
+
+
+if __name__ == "__main__":
+    main()
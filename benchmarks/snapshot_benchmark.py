@@ -0,0 +1,108 @@
+import argparse
+import copy
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Imported up front so the query timings exclude it
+import pandas
+
+from benchmarks.synthetic_data import STAGE_WEIGHTS, generate_startups
+from snapshot_store import SnapshotStore
+
+# Daily churn of a real catalogue, as fractions of its size
+STAGE_CHANGE_RATE = 0.002
+EDIT_RATE = 0.005
+REMOVAL_RATE = 0.0005
+GROWTH_RATE = 0.001
+
+
+def simulate_crawls(count: int, days: int, seed: int = 11) -> Iterator[List[Dict]]:
+    """
+    Yield ``days`` daily crawls of a catalogue that starts at ``count`` startups.
+
+    Every day a small fraction of startups change stage, get their text
+    edited or disappear, and new ones are added (see the ``*_RATE``
+    constants).
+    """
+    rng = random.Random(seed)
+    catalogue = {startup['id']: startup for startup in generate_startups(count)}
+    next_id = count + 1
+    stages = list(STAGE_WEIGHTS)
+    for day in range(days):
+        if day:
+            ids = list(catalogue)
+            for startup_id in rng.sample(ids, int(len(ids) * STAGE_CHANGE_RATE)):
+                catalogue[startup_id] = dict(catalogue[startup_id], stage=rng.choice(stages))
+            for startup_id in rng.sample(ids, int(len(ids) * EDIT_RATE)):
+                startup = copy.copy(catalogue[startup_id])
+                startup['short_description'] = f"{startup['short_description']} (updated day {day})"
+                catalogue[startup_id] = startup
+            for startup_id in rng.sample(ids, int(len(ids) * REMOVAL_RATE)):
+                del catalogue[startup_id]
+            for startup in generate_startups(max(int(len(ids) * GROWTH_RATE), 1), seed=seed + day):
+                catalogue[next_id] = dict(startup, id=next_id)
+                next_id += 1
+        yield list(catalogue.values())
+
+
+def _time(func, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def run(count: int, days: int, keep: str = None):
+    """Store ``days`` daily snapshots and time ingestion, size and trend queries."""
+    print("=" * 60)
+    print(f"Snapshot store benchmark ({count:,} startups, {days} daily snapshots)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        filename = keep or os.path.join(workdir, 'snapshots.db')
+        first_day = date(2025, 1, 1)
+        ingest = []
+        with SnapshotStore(filename) as store:
+            for day, crawl in enumerate(simulate_crawls(count, days)):
+                ingest.append(_time(store.add_snapshot, crawl, (first_day + timedelta(days=day)).isoformat()))
+                if day == 0:
+                    first_size = os.path.getsize(filename)
+            store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            size = os.path.getsize(filename)
+
+            first, last = first_day.isoformat(), (first_day + timedelta(days=days - 1)).isoformat()
+            queries = {
+                'trend(stage)': _time(store.trend, 'stage'),
+                'trend(industry)': _time(store.trend, 'industry'),
+                'transitions(first, last)': _time(store.transitions, first, last),
+                'iter_snapshot(last)': _time(lambda: sum(1 for _ in store.iter_snapshot(last))),
+            }
+
+    print(f"  First snapshot:      {ingest[0]:.2f}s, {first_size / 1e6:.1f} MB")
+    later = sorted(ingest[1:]) or [0.0]
+    print(f"  Later snapshots:     median {later[len(later) // 2]:.2f}s, max {later[-1]:.2f}s")
+    print(f"  Store after {days} days: {size / 1e6:.1f} MB ({size / first_size:.2f}x the first snapshot)")
+    print()
+    for name, seconds in queries.items():
+        print(f"  {name:<26}{seconds * 1000:>10.1f} ms")
+
+
+def main(argv=None):
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Measure snapshot store size and query cost over many crawls")
+    parser.add_argument('--count', type=int, default=20000, help="Startups in the first crawl")
+    parser.add_argument('--days', type=int, default=365, help="Number of daily snapshots")
+    parser.add_argument('--keep', metavar='PATH', help="Write the store to this path instead of a temp file")
+    args = parser.parse_args(argv)
+    run(args.count, args.days, args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay lazy: importing any of them at startup is a regression
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'pandas', 'numpy', 'pyarrow')
+
+# Cumulative import-time budgets in milliseconds
+IMPORT_BUDGETS_MS = {
+    'analyze_ecosystem': 150.0,
+    'startup_io': 50.0,
+}
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """
+    Import a module in a fresh interpreter under ``-X importtime``.
+
+    Returns:
+        Tuple of (cumulative import time in ms, top-level packages imported)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative_us = 0
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        packages.add(name.split('.')[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000.0, sorted(packages)
+
+
+def measure_command(args: List[str], repeat: int = 3) -> float:
+    """Best-of-N wall time of a CLI invocation in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=REPO_ROOT, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def run(budgets: Dict[str, float]) -> bool:
+    """Measure every module against its budget and report; True when all pass."""
+    ok = True
+    print("=" * 60)
+    print("Startup time benchmark (python -X importtime)")
+    print("=" * 60)
+
+    for module, budget in budgets.items():
+        elapsed, packages = measure_import(module)
+        heavy = [name for name in HEAVY_MODULES if name in packages]
+        status = "OK"
+        if elapsed > budget:
+            status = "SLOW"
+            ok = False
+        if heavy:
+            status = "EAGER"
+            ok = False
+        print(f"  {module}: {elapsed:.1f} ms (budget {budget:.0f} ms) [{status}]")
+        if heavy:
+            print(f"    imports heavy modules at startup: {', '.join(heavy)}")
+
+    list_ms = measure_command(['analyze_ecosystem.py', '--list'])
+    print(f"\n  analyze_ecosystem.py --list: {list_ms:.1f} ms wall-clock")
+    return ok
+
+
+def main(argv=None):
+    """Run the benchmark and exit non-zero on a regression."""
+    parser = argparse.ArgumentParser(description="Guard module startup time against regressions")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Multiply every budget (for slow CI machines)")
+    args = parser.parse_args(argv)
+
+    budgets = {module: budget * args.scale for module, budget in IMPORT_BUDGETS_MS.items()}
+    if not run(budgets):
+        print("\nStartup time regression detected.")
+        sys.exit(1)
+    print("\nAll startup budgets met.")
+
+
+if __name__ == "__main__":
+    main()
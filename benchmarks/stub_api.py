@@ -0,0 +1,158 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_data import generate_startups
+
+
+class StubStartupAPI:
+    """
+    Local stand-in for the paginated ``/api/startups/`` endpoint.
+
+    Serves ``count``/``next``/``results`` pages over ``limit``/``offset``,
+    filters on ``location`` (a region id, or ``all``), caps page sizes at
+    ``max_page_size`` (or answers 400 above it with ``reject_oversized``,
+    like APIs that validate ``limit``) and sleeps ``latency`` seconds per request to model
+    network round trips. ``/api/startups/<id>/`` returns one startup with
+    an extra ``description_html`` detail field. Responses carry a content
+    ETag and ``If-None-Match`` revalidation is answered with 304.
+    """
+
+    def __init__(self, startups: List[Dict], latency: float = 0.0, max_page_size: int = 1000,
+                 reject_oversized: bool = False, host: str = '127.0.0.1', port: int = 0):
+        self.startups = startups
+        self._by_id = {startup['id']: startup for startup in startups}
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.reject_oversized = reject_oversized
+        self.requests_served = 0
+        self.not_modified_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/startups/"
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                with api._lock:
+                    api.requests_served += 1
+                # Respond first so respond() overrides see the request when it arrives
+                status, body = api.respond(self.path)
+                if api.latency:
+                    time.sleep(api.latency)
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    with api._lock:
+                        api.not_modified_served += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def respond(self, path: str):
+        """Build the (status, JSON body) for a listing or ``/api/startups/<id>/`` detail path."""
+        url = urlparse(path)
+        detail_id = url.path.rstrip('/').rsplit('/', 1)[-1]
+        if detail_id.isdigit():
+            startup = self._by_id.get(int(detail_id))
+            if startup is None:
+                return 404, {'detail': 'Not found.'}
+            return 200, dict(startup, description_html=f"<p>{startup.get('description') or ''}</p>")
+        query = parse_qs(url.query)
+        try:
+            limit = int(query.get('limit', ['8'])[0])
+            offset = int(query.get('offset', ['0'])[0])
+        except ValueError:
+            return 400, {'detail': 'Invalid limit or offset'}
+        if limit > self.max_page_size:
+            if self.reject_oversized:
+                return 400, {'detail': f'limit must be at most {self.max_page_size}'}
+            limit = self.max_page_size
+        location = query.get('location', ['all'])[0]
+
+        startups = self.startups
+        if location != 'all':
+            startups = [s for s in startups if s.get('region') and str(s['region'].get('id')) == location]
+
+        results = startups[offset:offset + limit]
+        has_next = offset + limit < len(startups)
+        return 200, {
+            'count': len(startups),
+            'next': f"{self.base_url}?limit={limit}&offset={offset + limit}" if has_next else None,
+            'previous': None,
+            'results': results,
+        }
+
+    def start(self) -> 'StubStartupAPI':
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    """Serve a synthetic catalogue until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a stub StartupBase.uz API for offline crawling")
+    parser.add_argument('--count', type=int, default=1351, help="Number of synthetic startups")
+    parser.add_argument('--latency', type=float, default=0.05, help="Per-request latency in seconds")
+    parser.add_argument('--max-page-size', type=int, default=1000, help="Largest limit the API honours")
+    parser.add_argument('--reject-oversized', action='store_true',
+                        help="Answer 400 to larger limits instead of capping them")
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    api = StubStartupAPI(list(generate_startups(args.count)), latency=args.latency,
+                         max_page_size=args.max_page_size, reject_oversized=args.reject_oversized,
+                         port=args.port)
+    print(f"Serving {args.count} startups at {api.base_url}")
+    try:
+        api._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
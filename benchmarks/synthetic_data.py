@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, Iterator
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from startup_io import is_ndjson, open_text
+
+# Stage codes as returned by the API, weighted roughly like the November 2025 crawl
+STAGE_WEIGHTS = {
+    'pre_seed': 48.0,
+    'seed_': 28.1,
+    'idea': 12.8,
+    'early_a': 6.9,
+    'serias_a': 2.4,
+    'early_b': 1.0,
+    'expension': 0.6,
+    None: 0.2,
+}
+
+INDUSTRY_WEIGHTS = {
+    'SaaS': 219, 'EdTech': 215, 'HealthTech & MedTech': 156, 'AI & ML': 124,
+    'E-commerce & Retail Tech': 103, 'HRTech': 63, 'FinTech': 60, 'Logistics & Transportation': 44,
+    'AgriTech': 40, 'Travel & Tourism': 35, 'Gaming & Entertainment': 33, 'FoodTech': 30,
+    'Real Estate & PropTech': 28, 'Media & Content': 26, 'GreenTech & CleanTech': 23,
+    'Cybersecurity': 21, 'Blockchain & Cryptocurrency': 20, 'Cloud Computing & Infrastructure': 18,
+    'Data Analytics & Big Data': 16, 'IoT (Internet of Things)': 15, 'DevOps & Development Tools': 12,
+    'Automation & Robotics': 11, 'Fashion & Beauty': 10, 'Sports & Fitness': 9, 'LegalTech': 8,
+}
+
+REGIONS = [
+    ('Tashkent', 41.2995, 69.2401, 1032),
+    ('Fergana Region', 40.3864, 71.7864, 4),
+    ('Andijan Region', 40.7821, 72.3442, 2),
+    ('Samarkand Region', 39.6270, 66.9750, 1),
+    ('Bukhara Region', 39.7747, 64.4286, 1),
+    ('Namangan Region', 40.9983, 71.6726, 1),
+    ('Tashkent Region', 41.0000, 69.5000, 1),
+    ('Khorezm Region', 41.5500, 60.6333, 1),
+    ('Kashkadarya Region', 38.8600, 65.7900, 1),
+    ('Surkhandarya Region', 37.2400, 67.2800, 1),
+    ('Navoi Region', 40.1000, 65.3700, 1),
+    ('Jizzakh Region', 40.1200, 67.8400, 1),
+    ('Syrdarya Region', 40.5000, 68.7800, 1),
+    ('Republic of Karakalpakstan', 42.4600, 59.6000, 1),
+]
+NO_REGION_WEIGHT = 308
+
+WORDS = ("platform service users business data market customers mobile app online smart "
+         "students doctors farmers payments delivery analytics cloud secure fast local "
+         "Uzbekistan Tashkent solution automation learning health finance retail").split()
+
+
+def generate_startups(count: int, seed: int = 42, description_words: int = 60) -> Iterator[Dict]:
+    """
+    Yield synthetic startups with the StartupBase.uz API schema.
+
+    Records carry nested ``industry`` and ``region`` objects (``region`` is
+    None for about a fifth of them, as in the real data), raw stage codes
+    such as ``seed_``/``serias_a``/``expension`` and the four boolean flags.
+    """
+    rng = random.Random(seed)
+    stages = list(STAGE_WEIGHTS)
+    stage_weights = list(STAGE_WEIGHTS.values())
+    industries = [{'id': i + 1, 'name': name} for i, name in enumerate(INDUSTRY_WEIGHTS)]
+    industry_weights = list(INDUSTRY_WEIGHTS.values())
+    regions = [None] + [
+        {'id': i + 1, 'name': name, 'county': 'Uzbekistan', 'lat': str(lat), 'long': str(lon)}
+        for i, (name, lat, lon, _) in enumerate(REGIONS)
+    ]
+    region_weights = [NO_REGION_WEIGHT] + [weight for *_, weight in REGIONS]
+
+    for startup_id in range(1, count + 1):
+        name = f"{rng.choice(WORDS).title()}{rng.choice(WORDS).title()} {startup_id}"
+        yield {
+            'id': startup_id,
+            'name': name,
+            'logo': f"https://startupbase.uz/media/logos/{startup_id}.png" if rng.random() < 0.8 else None,
+            'image': f"https://startupbase.uz/media/images/{startup_id}.jpg" if rng.random() < 0.5 else None,
+            'short_description': " ".join(rng.choices(WORDS, k=12)),
+            'description': " ".join(rng.choices(WORDS, k=rng.randint(description_words // 2, description_words * 2))),
+            'industry': dict(rng.choices(industries, weights=industry_weights)[0]) if rng.random() < 0.99 else None,
+            'stage': rng.choices(stages, weights=stage_weights)[0],
+            'region': rng.choices(regions, weights=region_weights)[0],
+            'is_verified': False,
+            'digital_startup_awards_participant': rng.random() < 0.007,
+            'is_member': rng.random() < 0.115,
+            'tech_awards_winner': rng.random() < 0.007,
+        }
+
+
+def write_dataset(filename: str, count: int, seed: int = 42, description_words: int = 60):
+    """
+    Stream a synthetic dataset to disk without holding it in memory.
+
+    ``.jsonl`` (optionally ``.gz``/``.zst``) files get one record per line;
+    anything else gets the ``startups_data.json`` document layout.
+    """
+    records = generate_startups(count, seed, description_words)
+    with open_text(filename, 'wt') as f:
+        if is_ndjson(filename):
+            for startup in records:
+                f.write(json.dumps(startup, ensure_ascii=False) + "\n")
+        else:
+            f.write(f'{{"total_count": {count}, "startups": [')
+            for i, startup in enumerate(records):
+                f.write((",\n" if i else "\n") + json.dumps(startup, ensure_ascii=False))
+            f.write("\n]}\n")
+    print(f"Wrote {count} synthetic startups to {filename}")
+
+
+def main(argv=None):
+    """Generate a synthetic startups_data file."""
+    parser = argparse.ArgumentParser(description="Generate synthetic StartupBase.uz datasets")
+    parser.add_argument('count', type=int, help="Number of startups to generate")
+    parser.add_argument('--output', default="startups_data.json",
+                        help="Output file (.json, or .jsonl/.jsonl.gz/.jsonl.zst)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--description-words', type=int, default=60,
+                        help="Typical description length in words")
+    args = parser.parse_args(argv)
+    write_dataset(args.output, args.count, args.seed, args.description_words)
+
+
+if __name__ == "__main__":
+    main()
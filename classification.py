@@ -0,0 +1,82 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+# Classification table shipped with the report (see classification.json)
+DEFAULT_CLASSIFICATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'classification.json')
+
+# Normalized columns a custom segment can be derived from
+SEGMENT_SOURCES = ('industry', 'region', 'stage', 'stage_label')
+
+
+class Segment:
+    """A user-defined grouping of the values of one normalized column."""
+
+    def __init__(self, name: str, source: str, groups: Dict[str, List[str]], default: Optional[str] = None):
+        if source not in SEGMENT_SOURCES:
+            raise ValueError(f"Segment {name!r}: source must be one of {', '.join(SEGMENT_SOURCES)}, "
+                             f"not {source!r}")
+        self.name = name
+        self.source = source
+        self.default = default
+        # value -> group, inverted once so applying it is a per-category lookup
+        self.mapping = _invert(groups, f"segment {name!r}")
+
+
+def _invert(groups: Dict[str, List[str]], context: str) -> Dict[str, str]:
+    """Turn ``{group: [values]}`` into ``{value: group}``, rejecting values listed twice."""
+    mapping = {}
+    for group, values in groups.items():
+        for value in values:
+            if value in mapping:
+                raise ValueError(f"{context}: {value!r} is listed under both {mapping[value]!r} and {group!r}")
+            mapping[value] = group
+    return mapping
+
+
+class Classification:
+    """
+    Stage labels, scores and groups, tech industries and custom segments.
+
+    Built from a JSON table (see ``classification.json``). The lists of the
+    table are compiled into value -> label dictionaries once, so
+    ``ecosystem_aggregates.normalize`` can apply them per category of a
+    categorical column rather than per row.
+    """
+
+    def __init__(self, table: Dict):
+        self.not_specified: str = table.get('not_specified', 'Not Specified')
+        self.stage_labels: Dict[str, str] = dict(table['stage_labels'])
+        self.stage_order: List[str] = list(table['stage_order'])
+        self.stage_scores: Dict[str, int] = {label: int(score) for label, score in table['stage_scores'].items()}
+        self.stage_groups = _invert(table.get('stage_groups', {}), "stage_groups")
+        self.tech_industries: List[str] = list(table.get('tech_industries', []))
+        self.segments: Dict[str, Segment] = {
+            name: Segment(name, spec['source'], spec['groups'], spec.get('default'))
+            for name, spec in table.get('segments', {}).items()
+        }
+
+        labels = set(self.stage_labels.values()) | {self.not_specified}
+        missing = sorted(label for label in labels if label not in self.stage_scores)
+        if missing:
+            raise ValueError(f"stage_scores has no score for {', '.join(missing)}")
+        missing = sorted(label for label in labels if label not in self.stage_order)
+        if missing:
+            raise ValueError(f"stage_order does not list {', '.join(missing)}")
+
+    @property
+    def funnel_order(self) -> List[str]:
+        """Stage labels of the funding funnel (``stage_order`` without the not-specified bucket)."""
+        return [label for label in self.stage_order if label != self.not_specified]
+
+
+def load_classification(filename: str = DEFAULT_CLASSIFICATION) -> Classification:
+    """
+    Load a classification table from a JSON file.
+
+    Raises:
+        ValueError: If the table is inconsistent (a stage label without a
+            score, a value in two groups, an unknown segment source)
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        return Classification(json.load(f))
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+import instrumentation
+from classification import Classification, load_classification
+
+STATUS_COLUMNS = {
+    'Verified Startups': 'is_verified',
+    'Digital Awards\nParticipants': 'digital_startup_awards_participant',
+    'Platform Members': 'is_member',
+    'Tech Awards\nWinners': 'tech_awards_winner',
+}
+
+# Flattened columns the aggregation needs (see startup_io.FLAT_COLUMNS)
+AGGREGATE_COLUMNS = ['industry_name', 'stage', 'region_name'] + list(STATUS_COLUMNS.values())
+
+# Industries need at least this many staged startups to get a maturity score
+MIN_INDUSTRY_SIZE = 10
+
+
+def _ranked_counts(keys: pd.Series, weights: pd.Series) -> pd.Series:
+    """Weighted counts per key sorted descending, ties kept in order of first appearance."""
+    counts = weights.groupby(keys, sort=False, observed=True).sum()
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+def _weighted_mean(frame: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Per-group ``mean`` stage score and ``size`` (number of startups), honouring ``count``."""
+    grouped = frame.assign(score_total=frame['stage_score'] * frame['count'])
+    grouped = grouped.groupby(by, sort=False, observed=True)[['score_total', 'count']].sum()
+    return pd.DataFrame({'mean': grouped['score_total'] / grouped['count'], 'size': grouped['count']})
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    """View a column as a categorical, keeping categories in order of first appearance."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return pd.Series(pd.Categorical(series, categories=pd.unique(series.dropna())), index=series.index)
+
+
+def _recode(series: pd.Series, mapping: Dict, default=None) -> pd.Series:
+    """
+    Map a categorical column through ``mapping`` once per category.
+
+    The lookup runs over the (few) categories rather than the rows; each
+    row then just indexes the resulting code table. Values missing from
+    ``mapping``, and missing values, become ``default`` (None stays NA).
+    """
+    targets = [mapping.get(category, default) for category in series.cat.categories] + [default]
+    labels = list(dict.fromkeys(t for t in targets if t is not None))
+    table = np.array([-1 if t is None else labels.index(t) for t in targets], dtype=np.int32)
+    codes = table[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=series.index)
+
+
+def _fill_category(series: pd.Series, value: str) -> pd.Series:
+    """Replace missing values of a categorical column with ``value``."""
+    if value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def normalize(df: pd.DataFrame, classification: Classification) -> pd.DataFrame:
+    """
+    Derive the per-record columns every aggregate is built from.
+
+    Adds ``stage_label`` (display label, the not-specified label for missing
+    or unknown codes), ``stage_score``, ``is_tech``, ``stage_group``
+    ('early', 'growth' or NA), one column per custom segment of the
+    ``classification`` and ``count``. Industry, region, stage and the
+    derived labels are categoricals, so the classification is looked up per
+    category and every grouping works on small integer codes.
+
+    A ``count`` column in the input marks pre-aggregated rows (one row per
+    distinct combination, e.g. from ``StartupDB.aggregate_frame``); without
+    it every row counts as one startup.
+    """
+    out = pd.DataFrame(index=df.index)
+    out['industry'] = _as_category(df['industry_name'])
+    out['region'] = _as_category(df['region_name'])
+    out['stage'] = _as_category(df['stage'])
+    out['stage_label'] = _recode(out['stage'], classification.stage_labels, classification.not_specified)
+    scores = np.array([classification.stage_scores[label] for label in out['stage_label'].cat.categories],
+                      dtype=np.int64)
+    out['stage_score'] = scores[out['stage_label'].cat.codes.to_numpy()]
+    out['is_tech'] = out['industry'].isin(classification.tech_industries)
+    out['stage_group'] = _recode(out['stage_label'], classification.stage_groups)
+    for name, segment in classification.segments.items():
+        out[_segment_column(name)] = _recode(out[segment.source], segment.mapping, segment.default)
+    for column in STATUS_COLUMNS.values():
+        out[column] = df[column].fillna(False).astype(bool)
+    out['count'] = df['count'].astype(int) if 'count' in df.columns else 1
+    return out
+
+
+def _segment_column(name: str) -> str:
+    return f'segment.{name}'
+
+
+def _segment_summary(data: pd.DataFrame, weights: pd.DataFrame, column: str) -> Dict:
+    """
+    Startups, growth-stage startups and average maturity per segment group.
+
+    ``weights`` holds the per-row ``count``, ``growth``, ``staged`` and
+    ``score_total`` columns shared by every segment, so each one costs a
+    single grouped sum. Groups are ranked by size; the maturity average only
+    counts startups with a stage code (None when a group has none).
+    """
+    totals = weights.groupby(data[column], sort=False, observed=True).sum()
+    totals = totals.sort_values('count', ascending=False, kind='stable')
+    return {
+        group: {
+            'count': int(row['count']),
+            'growth': int(row['growth']),
+            'avg_maturity': float(row['score_total'] / row['staged']) if row['staged'] else None,
+        }
+        for group, row in totals.iterrows()
+    }
+
+
+def compute_aggregates(df: pd.DataFrame, classification: Optional[Classification] = None) -> Dict:
+    """
+    Compute every counter, crosstab and maturity statistic used by the report.
+
+    Args:
+        df: Flat startups frame with at least ``AGGREGATE_COLUMNS``, optionally
+            pre-aggregated with a ``count`` column
+        classification: Stage and industry classification with any custom
+            segments (``classification.json`` when omitted)
+
+    Returns:
+        Dictionary of precomputed results keyed by chart input name
+    """
+    if classification is None:
+        classification = load_classification()
+    stage_order = classification.stage_order
+
+    with instrumentation.phase('aggregate.normalize'):
+        data = normalize(df, classification)
+        total = int(data['count'].sum())
+        with_industry = data[data['industry'].notna()]
+
+    # Industries, stages and regions
+    with instrumentation.phase('aggregate.counts'):
+        industry_counts = _ranked_counts(data['industry'], data['count'])
+        stage_counts = _ranked_counts(data['stage_label'], data['count'])
+        stage_counts_ordered = {k: int(stage_counts.get(k, 0)) for k in stage_order if stage_counts.get(k, 0) > 0}
+        region_counts = _ranked_counts(_fill_category(data['region'], classification.not_specified), data['count'])
+
+    # Industry vs stage crosstab for the ten largest industries
+    with instrumentation.phase('aggregate.industry_stage_crosstab'):
+        top_10_industries = list(industry_counts.head(10).index)
+        top_rows = with_industry[with_industry['industry'].isin(top_10_industries)]
+        heatmap_data = pd.crosstab(top_rows['industry'], top_rows['stage_label'],
+                                   values=top_rows['count'], aggfunc='sum').fillna(0).astype(int)
+        heatmap_data.index = heatmap_data.index.astype(object)
+        heatmap_data = heatmap_data.sort_index()[[s for s in stage_order if s in heatmap_data.columns]]
+
+    # Verification and awards
+    with instrumentation.phase('aggregate.status'):
+        status_data = {label: int(data.loc[data[column], 'count'].sum()) for label, column in STATUS_COLUMNS.items()}
+
+    # Maturity per industry, counting only startups with a stage code
+    with instrumentation.phase('aggregate.industry_maturity'):
+        staged = with_industry[with_industry['stage'].notna() & (with_industry['stage'] != '')]
+        maturity = _weighted_mean(staged, 'industry')
+        industry_avg_maturity = maturity.loc[maturity['size'] >= MIN_INDUSTRY_SIZE, 'mean']
+        industry_avg_maturity = industry_avg_maturity.sort_values(ascending=False, kind='stable')
+
+    # Tech vs non-tech
+    with instrumentation.phase('aggregate.tech_split'):
+        tech = _weighted_mean(with_industry, 'is_tech')
+        tech_count = int(tech['size'].get(True, 0))
+        non_tech_count = int(tech['size'].get(False, 0))
+        avg_tech_maturity = float(tech['mean'].get(True, 0.0))
+        avg_non_tech_maturity = float(tech['mean'].get(False, 0.0))
+
+    # Early vs growth stage per industry
+    with instrumentation.phase('aggregate.early_vs_growth'):
+        split = pd.crosstab(with_industry['industry'], with_industry['stage_group'],
+                            values=with_industry['count'], aggfunc='sum').fillna(0).astype(int)
+        split = split.reindex(index=pd.unique(with_industry['industry']),
+                              columns=['early', 'growth'], fill_value=0)
+        split = split.sort_values('growth', ascending=False, kind='stable')
+
+    # User-defined segmentations
+    with instrumentation.phase('aggregate.segments'):
+        staged_count = data['count'].where(data['stage'].notna() & (data['stage'] != ''), 0)
+        weights = pd.DataFrame({
+            'count': data['count'],
+            'growth': data['count'].where(data['stage_group'] == 'growth', 0),
+            'staged': staged_count,
+            'score_total': data['stage_score'] * staged_count,
+        })
+        segments = {name: _segment_summary(data, weights, _segment_column(name))
+                    for name in classification.segments}
+
+    key_metrics = {
+        'Total Startups': total,
+        'Active Industries': int(data['industry'].nunique()),
+        'Covered Regions': int(data['region'].nunique()),
+        'Growth Stage\nStartups': int(data.loc[data['stage_group'] == 'growth', 'count'].sum()),
+        'Tech Startups': tech_count,
+        'Platform\nMembers': status_data['Platform Members']
+    }
+
+    return {
+        'total': total,
+        'industry_counts': {k: int(v) for k, v in industry_counts.items()},
+        'top_industries': {k: int(v) for k, v in industry_counts.head(15).items()},
+        'stage_counts': {k: int(v) for k, v in stage_counts.items()},
+        'stage_counts_ordered': stage_counts_ordered,
+        'top_regions': {k: int(v) for k, v in region_counts.head(10).items()},
+        'heatmap_data': heatmap_data,
+        'status_data': status_data,
+        'funnel_data': {stage: int(stage_counts.get(stage, 0)) for stage in classification.funnel_order},
+        'industry_avg_maturity': {k: float(v) for k, v in industry_avg_maturity.items()},
+        'top_mature_industries': {k: float(v) for k, v in industry_avg_maturity.head(12).items()},
+        'tech_count': tech_count,
+        'non_tech_count': non_tech_count,
+        'avg_tech_maturity': avg_tech_maturity,
+        'avg_non_tech_maturity': avg_non_tech_maturity,
+        'early_vs_growth': {k: {'early': int(r['early']), 'growth': int(r['growth'])}
+                            for k, r in split.head(10).iterrows()},
+        'segments': segments,
+        'key_metrics': key_metrics,
+    }
+
+
+def to_summary(agg: Dict) -> Dict:
+    """
+    Convert aggregates into a JSON-serializable summary document.
+
+    The heatmap crosstab becomes a nested ``{industry: {stage: count}}``
+    mapping and the line breaks used in chart labels become spaces.
+    """
+    def clean(mapping: Dict) -> Dict:
+        return {label.replace('\n', ' '): value for label, value in mapping.items()}
+
+    summary = {}
+    for key, value in agg.items():
+        if key == 'heatmap_data':
+            summary['industry_stage_crosstab'] = {
+                industry: {stage: int(count) for stage, count in row.items()}
+                for industry, row in value.iterrows()
+            }
+        elif key in ('status_data', 'key_metrics'):
+            summary[key] = clean(value)
+        else:
+            summary[key] = value
+    return summary
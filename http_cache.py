@@ -0,0 +1,176 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import instrumentation
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS response (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_response_accessed ON response(accessed_at);
+"""
+
+# Response headers kept with a cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Raised in offline mode for a request that is not in the cache."""
+
+
+def cache_key(url: str) -> str:
+    """Canonical cache key: the URL with its query parameters sorted."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+
+
+class HTTPCache:
+    """
+    On-disk cache of GET responses, keyed by URL and query parameters.
+
+    Entries younger than ``ttl`` seconds are served without touching the
+    network; older ones are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since`` so an unchanged page costs a 304 instead of a
+    download. Bodies are stored zlib-compressed and the least recently
+    used entries are evicted once the cache grows past ``max_bytes``. In
+    ``offline`` mode every request is answered from the cache regardless
+    of age, and anything missing raises ``CacheMiss``.
+    """
+
+    def __init__(self, filename: str = "http_cache.db", ttl: float = 3600.0,
+                 max_bytes: int = 512 * 1024 * 1024, offline: bool = False):
+        self.filename = filename
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up an entry and mark it as recently used."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM response WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE response SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        status, headers, body, etag, last_modified, stored_at = row
+        return {'status': status, 'headers': json.loads(headers), 'body': zlib.decompress(body),
+                'etag': etag, 'last_modified': last_modified, 'stored_at': stored_at}
+
+    def put(self, key: str, response: requests.Response):
+        """Store a successful response body, evicting old entries if needed."""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock, self.conn:
+            previous = self.conn.execute("SELECT size FROM response WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.status_code, json.dumps(headers), body, len(body),
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now)
+            )
+            self.total_bytes += len(body) - (previous[0] if previous else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str):
+        """Mark an entry as freshly validated (after a 304)."""
+        with self._lock, self.conn:
+            now = time.time()
+            self.conn.execute("UPDATE response SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is back under 90% of its budget."""
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for key, size in self.conn.execute("SELECT key, size FROM response ORDER BY accessed_at").fetchall():
+            if self.total_bytes <= target:
+                break
+            self.conn.execute("DELETE FROM response WHERE key = ?", (key,))
+            self.total_bytes -= size
+            evicted += 1
+        instrumentation.count('http_cache_evictions', evicted)
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self.conn.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that answers GET requests through an ``HTTPCache``."""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def _cached_response(self, request: requests.PreparedRequest, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        key = cache_key(request.url)
+        entry = self.cache.get(key)
+        if self.cache.offline:
+            if entry is None:
+                instrumentation.count('http_cache_misses')
+                raise CacheMiss(f"{request.url} is not in the HTTP cache (offline mode)", request=request)
+            instrumentation.count('http_cache_hits')
+            return self._cached_response(request, entry)
+
+        if entry is not None and time.time() - entry['stored_at'] < self.cache.ttl:
+            instrumentation.count('http_cache_hits')
+            return self._cached_response(request, entry)
+
+        if entry is not None:
+            request = request.copy()
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            instrumentation.count('http_cache_revalidated')
+            self.cache.touch(key)
+            return self._cached_response(request, entry)
+
+        instrumentation.count('http_cache_misses')
+        if response.status_code == 200:
+            self.cache.put(key, response)
+        return response
@@ -0,0 +1,208 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+# resource is Unix-only; on Windows the peak RSS comes from psutil if installed
+try:
+    import resource
+except ImportError:
+    resource = None
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+# Prometheus-style latency buckets in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process so far, in MB.
+
+    Returns 0.0 where it cannot be measured (Windows without psutil), so
+    memory figures read as zero instead of the run failing.
+    """
+    if resource is None:
+        if psutil is None:
+            return 0.0
+        # peak_wset is the Windows peak working set, in bytes
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class RunReport:
+    """
+    Thread-safe collector of per-phase timings, counters and histograms.
+
+    Phases accumulate wall time and call counts under their name and
+    remember the largest growth of the process peak RSS during one call,
+    i.e. the memory that call needed beyond what was already held (phases
+    that overlap, such as nested ones, are each charged for it). Histograms use
+    cumulative ``LATENCY_BUCKETS`` so they export directly to Prometheus.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Dict] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of work and record it under ``name``."""
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - started, peak_rss_mb() - rss_before)
+
+    def record_phase(self, name: str, seconds: float, rss_growth_mb: float, calls: int = 1):
+        """Add an externally measured phase (e.g. from a worker process)."""
+        with self._lock:
+            stats = self.phases.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                                  'rss_growth_mb': 0.0})
+            stats['calls'] += calls
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['rss_growth_mb'] = max(stats['rss_growth_mb'], rss_growth_mb)
+
+    def count(self, name: str, value: int = 1):
+        """Increment a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        """Add one observation to a histogram."""
+        with self._lock:
+            histogram = self.histograms.setdefault(name, {
+                'buckets': [0] * len(LATENCY_BUCKETS), 'count': 0, 'sum': 0.0})
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['count'] += 1
+            histogram['sum'] += value
+
+    def to_dict(self) -> Dict:
+        """Machine-readable snapshot of everything recorded so far."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'started_at': self.started_at,
+                'wall_seconds': time.perf_counter() - self._started,
+                'peak_rss_mb': peak_rss_mb(),
+                'phases': {name: dict(stats) for name, stats in self.phases.items()},
+                'counters': dict(self.counters),
+                'histograms': {
+                    name: {'le': LATENCY_BUCKETS, 'buckets': list(h['buckets']),
+                           'count': h['count'], 'sum': h['sum']}
+                    for name, h in self.histograms.items()
+                },
+            }
+
+    def write_json(self, filename: str):
+        """Write the run report as JSON."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"Run report saved to {filename}")
+
+    def write_prometheus(self, filename: str):
+        """
+        Write the report in the Prometheus textfile-collector format.
+
+        The file is written to a temporary name and renamed so the collector
+        never reads a partial file.
+        """
+        report = self.to_dict()
+        job = _label(report['name'])
+        lines: List[str] = [
+            '# TYPE startupbase_run_wall_seconds gauge',
+            f'startupbase_run_wall_seconds{{job="{job}"}} {report["wall_seconds"]:.6f}',
+            '# TYPE startupbase_run_peak_rss_mb gauge',
+            f'startupbase_run_peak_rss_mb{{job="{job}"}} {report["peak_rss_mb"]:.3f}',
+            '# TYPE startupbase_phase_seconds gauge',
+            '# TYPE startupbase_phase_calls gauge',
+            '# TYPE startupbase_phase_rss_growth_mb gauge',
+        ]
+        for name, stats in report['phases'].items():
+            labels = f'job="{job}",phase="{_label(name)}"'
+            lines.append(f'startupbase_phase_seconds{{{labels}}} {stats["seconds"]:.6f}')
+            lines.append(f'startupbase_phase_calls{{{labels}}} {stats["calls"]}')
+            lines.append(f'startupbase_phase_rss_growth_mb{{{labels}}} {stats["rss_growth_mb"]:.3f}')
+        for name, value in report['counters'].items():
+            metric = f'startupbase_{_metric(name)}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{{job="{job}"}} {value}')
+        for name, histogram in report['histograms'].items():
+            metric = f'startupbase_{_metric(name)}'
+            lines.append(f'# TYPE {metric} histogram')
+            for bound, bucket in zip(histogram['le'], histogram['buckets']):
+                lines.append(f'{metric}_bucket{{job="{job}",le="{bound}"}} {bucket}')
+            lines.append(f'{metric}_bucket{{job="{job}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{metric}_sum{{job="{job}"}} {histogram["sum"]:.6f}')
+            lines.append(f'{metric}_count{{job="{job}"}} {histogram["count"]}')
+
+        tmp = f"{filename}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, filename)
+        print(f"Prometheus metrics saved to {filename}")
+
+    def print_summary(self, limit: Optional[int] = 10):
+        """Print the slowest phases."""
+        report = self.to_dict()
+        phases = sorted(report['phases'].items(), key=lambda x: x[1]['seconds'], reverse=True)
+        print(f"\nSlowest phases ({report['wall_seconds']:.2f}s total, peak RSS {report['peak_rss_mb']:.1f} MB):")
+        for name, stats in phases[:limit]:
+            print(f"  {name}: {stats['seconds']:.3f}s over {stats['calls']} call(s)")
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _metric(name: str) -> str:
+    return ''.join(c if c.isalnum() else '_' for c in name)
+
+
+# Process-wide report used by the scraper and analyzer
+_current = RunReport(os.path.basename(sys.argv[0]) or 'python')
+
+
+def current() -> RunReport:
+    """The active run report."""
+    return _current
+
+
+def start_run(name: str) -> RunReport:
+    """Begin a fresh run report named after the job."""
+    global _current
+    _current = RunReport(name)
+    return _current
+
+
+def phase(name: str):
+    """Time a block of work on the active report."""
+    return _current.phase(name)
+
+
+def count(name: str, value: int = 1):
+    """Increment a counter on the active report."""
+    _current.count(name, value)
+
+
+def observe(name: str, value: float):
+    """Add a histogram observation on the active report."""
+    _current.observe(name, value)
@@ -0,0 +1,144 @@
+import argparse
+import json
+import re
+from typing import Callable, Dict
+
+# Generated blocks live between <!-- summary:NAME --> and <!-- /summary:NAME --> markers
+BLOCK_PATTERN = re.compile(r'(<!-- summary:(\w+) -->\n)(.*?)(<!-- /summary:\2 -->)', re.DOTALL)
+
+
+def _percent(value: int, total: int) -> str:
+    return f"{value / total * 100:.1f}%" if total else "0.0%"
+
+
+def render_key_highlights(summary: Dict) -> str:
+    """Executive-summary bullets: catalogue size, coverage and stage shares."""
+    total = summary['total']
+    metrics = summary['key_metrics']
+    early = sum(split['early'] for split in summary['early_vs_growth'].values())
+    return (f"- **Total Startups Analyzed:** {total:,}\n"
+            f"- **Active Industries:** {metrics['Active Industries']}\n"
+            f"- **Geographic Coverage:** {metrics['Covered Regions']} regions\n"
+            f"- **Tech Startups:** {_percent(summary['tech_count'], total)} of total ecosystem\n"
+            f"- **Early-Stage Dominance:** {_percent(early, total)} in an early stage\n"
+            f"- **Growth Stage Gap:** Only {_percent(metrics['Growth Stage Startups'], total)} "
+            f"have reached a growth stage\n")
+
+
+def render_top_industries(summary: Dict) -> str:
+    """Bullet list of the five industries with the most startups."""
+    total = summary['total']
+    leaders = sorted(summary['industry_counts'].items(), key=lambda x: x[1], reverse=True)[:5]
+    return "".join(f"- **{industry} ({count:,} startups)** - {_percent(count, total)} of all startups\n"
+                   for industry, count in leaders)
+
+
+def render_stage_distribution(summary: Dict) -> str:
+    """Bullet list of startups per funding stage, largest first."""
+    total = summary['total']
+    counts = sorted(summary['stage_counts_ordered'].items(), key=lambda x: x[1], reverse=True)
+    return "".join(f"- **{stage}:** {count:,} startups ({_percent(count, total)})\n" for stage, count in counts)
+
+
+def render_top_regions(summary: Dict) -> str:
+    """Bullet list of the regions with the most startups."""
+    total = summary['total']
+    return "".join(f"- **{region}:** {count:,} startups ({_percent(count, total)})\n"
+                   for region, count in summary['top_regions'].items())
+
+
+def render_engagement(summary: Dict) -> str:
+    """Verification, award and membership counts."""
+    total = summary['total']
+    return "".join(f"- **{label}:** {count:,} ({_percent(count, total)})\n"
+                   for label, count in summary['status_data'].items())
+
+
+def render_key_metrics(summary: Dict) -> str:
+    """Headline ecosystem metrics."""
+    return "".join(f"- **{label}:** {value:,}\n" for label, value in summary['key_metrics'].items())
+
+
+def render_tech_vs_nontech(summary: Dict) -> str:
+    """Tech vs non-tech counts and average maturity scores."""
+    tech, non_tech = summary['tech_count'], summary['non_tech_count']
+    total = tech + non_tech
+    return (f"**Tech Industries:** {tech:,} startups ({_percent(tech, total)})\n"
+            f"- Average Maturity Score: {summary['avg_tech_maturity']:.2f}\n"
+            f"\n"
+            f"**Non-Tech Industries:** {non_tech:,} startups ({_percent(non_tech, total)})\n"
+            f"- Average Maturity Score: {summary['avg_non_tech_maturity']:.2f}\n")
+
+
+def render_industry_maturity(summary: Dict) -> str:
+    """The three most and three least mature industries by average maturity score."""
+    most = list(summary['top_mature_industries'].items())[:3]
+    least = sorted(summary['industry_avg_maturity'].items(), key=lambda x: x[1])[:3]
+    lines = ["**Most Mature Industries** (Higher avg. stage):"]
+    lines += [f"{i}. **{industry}** ({score:.2f})" for i, (industry, score) in enumerate(most, 1)]
+    lines += ["", "**Least Mature Industries** (Lower avg. stage):"]
+    lines += [f"{i}. **{industry}** ({score:.2f})" for i, (industry, score) in enumerate(least, 1)]
+    return "\n".join(lines) + "\n"
+
+
+def render_early_vs_growth(summary: Dict) -> str:
+    """The three industries with the most growth-stage startups."""
+    leaders = sorted(summary['early_vs_growth'].items(), key=lambda x: x[1]['growth'], reverse=True)[:3]
+    return "".join(f"- **{industry}:** {split['growth']:,} growth-stage startups\n"
+                   for industry, split in leaders)
+
+
+RENDERERS: Dict[str, Callable[[Dict], str]] = {
+    'key_highlights': render_key_highlights,
+    'top_industries': render_top_industries,
+    'stage_distribution': render_stage_distribution,
+    'top_regions': render_top_regions,
+    'engagement': render_engagement,
+    'key_metrics': render_key_metrics,
+    'tech_vs_nontech': render_tech_vs_nontech,
+    'industry_maturity': render_industry_maturity,
+    'early_vs_growth': render_early_vs_growth,
+}
+
+
+def update_readme(summary: Dict, readme_path: str = "README.md") -> int:
+    """
+    Regenerate every marked numeric block in the README from a summary.
+
+    Returns:
+        Number of blocks rewritten
+    """
+    with open(readme_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    updated = 0
+
+    def replace(match):
+        nonlocal updated
+        renderer = RENDERERS.get(match.group(2))
+        if renderer is None:
+            return match.group(0)
+        updated += 1
+        return match.group(1) + renderer(summary) + match.group(4)
+
+    text = BLOCK_PATTERN.sub(replace, text)
+    with open(readme_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    print(f"Updated {updated} summary blocks in {readme_path}")
+    return updated
+
+
+def main(argv=None):
+    """Regenerate README tables from a --summary-json document."""
+    parser = argparse.ArgumentParser(description="Regenerate README numeric tables from a summary JSON file")
+    parser.add_argument('summary_json', help="Output of analyze_ecosystem.py --summary-json")
+    parser.add_argument('--readme', default="README.md", help="README file to update in place")
+    args = parser.parse_args(argv)
+
+    with open(args.summary_json, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    update_readme(summary, args.readme)
+
+
+if __name__ == "__main__":
+    main()
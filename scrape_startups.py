@@ -1,41 +1,488 @@
 import requests
+import argparse
 import json
-import csv
+import hashlib
+import math
+import os
+import random
+import threading
 import time
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+from http_cache import CachingAdapter, HTTPCache
+from startup_db import StartupDB
+from snapshot_store import SnapshotStore
+from startup_io import CSVWriter, NDJSONWriter, iter_startups, save_to_parquet
+
+# Headers to mimic browser request
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en',
+    'Referer': 'https://startupbase.uz/en/startups',
+}
+
+# Explicit (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Page size used by the startupbase.uz frontend, and the upper bound we probe
+BROWSER_PAGE_SIZE = 8
+MAX_PROBE_PAGE_SIZE = 1000
+
+# Detail endpoint for a single startup, formatted with the listing URL and the startup id
+DEFAULT_DETAIL_URL = "{base_url}{id}/"
+
+# Called with (offset, results, total_count) after each page; returning True stops the crawl
+PageCallback = Callable[[int, List[Dict], int], bool]
+
+
+def chain_page_callbacks(*callbacks: Optional[PageCallback]) -> Optional[PageCallback]:
+    """Combine page callbacks; every callback sees every page and any of them may stop the crawl."""
+    active = [callback for callback in callbacks if callback is not None]
+    if not active:
+        return None
+    if len(active) == 1:
+        return active[0]
+
+    def chained(offset: int, results: List[Dict], total_count: int) -> bool:
+        stop = False
+        for callback in active:
+            stop = bool(callback(offset, results, total_count)) or stop
+        return stop
+
+    return chained
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may issue its next request."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HostRateLimiter:
+    """Thread-safe per-host rate limiting: each host gets its own `rate` per second budget."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        """Block until the caller may issue its next request to the host of `url`."""
+        host = urlparse(url).netloc
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.rate)
+        limiter.wait()
+
+
+def create_session(
+    pool_size: int = 10,
+    headers: Optional[Dict] = None,
+    cache: Optional[HTTPCache] = None
+) -> requests.Session:
+    """
+    Create a keep-alive session backed by a connection pool.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host
+        headers: Default headers sent with every request
+        cache: Answer GET requests through this on-disk HTTP cache
+
+    Returns:
+        A configured requests.Session
+    """
+    session = requests.Session()
+    if cache is not None:
+        adapter = CachingAdapter(cache, pool_connections=pool_size, pool_maxsize=pool_size)
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(headers if headers is not None else DEFAULT_HEADERS)
+    return session
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, backoff: float, max_backoff: float) -> float:
+    """Exponential backoff with full jitter for the given (0-based) attempt."""
+    return random.uniform(0, min(max_backoff, backoff * (2 ** attempt)))
+
+
+def _describe_request(url: str, params: Dict) -> str:
+    return f"offset {params['offset']}" if 'offset' in params else url
+
+
+def fetch_page(
+    session: requests.Session,
+    base_url: str,
+    params: Dict,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    retries: int = 5,
+    backoff: float = 0.5,
+    max_backoff: float = 30.0
+) -> Dict:
+    """
+    Fetch a single page of the listing endpoint (or any JSON resource, such
+    as a detail page, with empty params) and return the decoded JSON.
+
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff and jitter. A Retry-After header takes precedence
+    over the computed backoff.
+
+    Raises:
+        requests.exceptions.RequestException: once all retries are exhausted
+    """
+    for attempt in range(retries + 1):
+        if attempt:
+            instrumentation.count('http_retries')
+        started = time.perf_counter()
+        try:
+            with instrumentation.phase('http_request'):
+                response = session.get(base_url, params=params, timeout=timeout)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            instrumentation.count('http_errors')
+            if attempt == retries:
+                raise
+            wait = _backoff_delay(attempt, backoff, max_backoff)
+            print(f"\n  {type(e).__name__} at {_describe_request(base_url, params)}, retrying in {wait:.2f}s", end=" ")
+        else:
+            instrumentation.observe('http_request_seconds', time.perf_counter() - started)
+            instrumentation.count(f'http_responses_{response.status_code}')
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                response.raise_for_status()
+                with instrumentation.phase('json_decode'):
+                    return response.json()
+            retry_after = _retry_after_seconds(response)
+            wait = retry_after if retry_after is not None else _backoff_delay(attempt, backoff, max_backoff)
+            print(f"\n  HTTP {response.status_code} at {_describe_request(base_url, params)}, "
+                  f"retrying in {wait:.2f}s", end=" ")
+        time.sleep(wait)
+
+
+def negotiate_page_size(
+    session: requests.Session,
+    base_url: str,
+    location: str = "all",
+    start: int = BROWSER_PAGE_SIZE,
+    ceiling: int = MAX_PROBE_PAGE_SIZE
+) -> Tuple[int, int, float, Optional[Dict]]:
+    """
+    Find the largest ``limit`` the API actually honours.
+
+    The page size is doubled from ``start`` until the number of returned
+    results stops growing with it (the server caps pages), the whole
+    catalogue fits in one page, or ``ceiling`` is reached. Once a probe is
+    rejected outright, the size is binary-searched between the largest
+    accepted and the smallest rejected one.
+
+    Every probe requests offset 0, so the response to the probe at the
+    negotiated size is returned as well and the crawl need not fetch it again.
+
+    Returns:
+        Tuple of (page size, number of probe requests, mean probe latency in
+        seconds, offset-0 page at that size or None when no probe succeeded)
+    """
+    limit = start
+    page = None
+    accepted = 0
+    rejected = None
+    candidate = start
+    probes = 0
+    elapsed = 0.0
+
+    while True:
+        params = {'limit': candidate, 'location': location, 'offset': 0}
+        started = time.monotonic()
+        try:
+            data = fetch_page(session, base_url, params, retries=1)
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"Page size {candidate} rejected ({e})")
+            rejected = candidate
+        else:
+            returned = len(data.get('results', []))
+            if returned >= data.get('count', 0):
+                limit, page = max(candidate, 1), data
+                break
+            if returned < candidate:
+                # Server capped the page; crawl at exactly the size it serves
+                if returned > 0:
+                    limit, page = returned, data
+                break
+            accepted, limit, page = candidate, candidate, data
+        finally:
+            probes += 1
+            elapsed += time.monotonic() - started
+
+        if rejected is None:
+            if candidate >= ceiling:
+                break
+            candidate = min(candidate * 2, ceiling)
+        else:
+            # Nothing accepted yet means the API is failing rather than refusing the size
+            if not accepted or rejected - accepted <= 1:
+                break
+            candidate = (accepted + rejected) // 2
+
+    print(f"Negotiated page size: {limit} ({probes} probe requests)")
+    return limit, probes, elapsed / probes, page
+
+
+class CrawlJournal:
+    """
+    Append-only JSON Lines checkpoint of fetched pages.
+
+    Every page is appended as one line holding its offset, page size,
+    location, ``count``, ``next`` and ``results`` as soon as it arrives, so
+    a killed crawl can be resumed without refetching those offsets. A torn
+    final line from a crash mid-write is ignored on load.
+    """
+
+    def __init__(self, filename: str = "crawl_journal.jsonl", resume: bool = False, sync_every: int = 10):
+        self.filename = filename
+        self.sync_every = sync_every
+        self.pages: Dict[int, Dict] = {}
+        self.limit = None
+        self.location = None
+        self._unsynced = 0
+        if resume:
+            self._load()
+        self._file = open(filename, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.pages[entry['offset']] = entry
+                self.limit = entry['limit']
+                self.location = entry['location']
+
+    def record(self, offset: int, limit: int, location: str, data: Dict):
+        """Append one fetched page and flush it to disk."""
+        entry = {
+            'offset': offset,
+            'limit': limit,
+            'location': location,
+            'count': data.get('count'),
+            'next': data.get('next'),
+            'results': data.get('results', []),
+        }
+        # Only restored pages need their results in memory; keep a marker for new ones
+        self.pages[offset] = dict(entry, results=None)
+        self.limit = limit
+        self.location = location
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    @property
+    def complete(self) -> bool:
+        """True when every offset up to the reported ``count`` is journaled."""
+        if not self.pages or not self.limit:
+            return False
+        count = max(entry.get('count') or 0 for entry in self.pages.values())
+        return all(offset in self.pages for offset in range(0, count, self.limit))
+
+    def close(self):
+        """Sync and close the journal file."""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def discard(self):
+        """Close and delete the journal once its data has been saved elsewhere."""
+        self.close()
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+def _fetch_remaining_concurrently(
+    base_url: str,
+    offsets: List[int],
+    limit: int,
+    location: str,
+    session: requests.Session,
+    workers: int,
+    max_rps: float,
+    total_count: int = 0,
+    on_page: Optional[PageCallback] = None,
+    journal: Optional[CrawlJournal] = None,
+    collect: bool = True,
+    limiter: Optional[RateLimiter] = None
+) -> Tuple[List[Dict], int]:
+    """
+    Fetch the given offsets through a bounded thread pool.
+
+    Pages are returned in offset order. Collection stops at the first page
+    that fails (so the result never contains gaps) or when ``on_page``
+    asks to stop; pages not yet started are cancelled in both cases.
+
+    Requests are spaced by ``limiter`` when given (shared with other
+    crawls), otherwise by a limiter of ``max_rps`` of their own.
+
+    Returns:
+        Tuple of (collected startups, number of startups received)
+    """
+    if limiter is None:
+        limiter = RateLimiter(max_rps)
+
+    def fetch(offset: int):
+        if journal is not None and offset in journal.pages:
+            return offset, journal.pages[offset], None
+        limiter.wait()
+        params = {'limit': limit, 'location': location, 'offset': offset}
+        try:
+            return offset, fetch_page(session, base_url, params), None
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            return offset, None, e
+
+    startups = []
+    received = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # map() yields in submission order, so pages come back sorted by offset
+        for offset, data, error in executor.map(fetch, offsets):
+            if error is not None:
+                print(f"\nError fetching data at offset {offset} after retries: {error}")
+                print("WARNING: dataset is incomplete, stopping at the first failed page")
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+            results = data.get('results', [])
+            if not results:
+                print("No more results found.")
+                break
+            if journal is not None and offset not in journal.pages:
+                journal.record(offset, limit, location, data)
+            received += len(results)
+            instrumentation.count('startups_fetched', len(results))
+            if collect:
+                startups.extend(results)
+            print(f"Offset {offset}: got {len(results)} startups")
+            if on_page is not None and on_page(offset, results, total_count):
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+
+    return startups, received
+
 
 def scrape_startupbase_api(
     base_url: str = "https://startupbase.uz/api/startups/",
-    limit: int = 8,
+    limit: Optional[int] = None,
     location: str = "all",
-    delay: float = 0.5
+    delay: float = 0.5,
+    workers: int = 1,
+    max_rps: float = 4.0,
+    session: Optional[requests.Session] = None,
+    on_page: Optional[PageCallback] = None,
+    journal: Optional[CrawlJournal] = None,
+    collect: bool = True,
+    limiter: Optional[RateLimiter] = None
 ) -> List[Dict]:
     """
     Scrape all startups from the StartupBase.uz API using pagination.
 
+    With ``workers > 1`` the first page is fetched to learn ``count``, then
+    every remaining offset is fetched concurrently through a bounded thread
+    pool, throttled globally to ``max_rps`` requests per second.
+
+    All requests share one pooled keep-alive session and transient failures
+    are retried with backoff (see ``fetch_page``).
+
+    When ``limit`` is omitted the largest page size the server honours is
+    negotiated first (see ``negotiate_page_size``).
+
+    With a ``journal`` every fetched page is checkpointed to disk, and
+    offsets already present in a resumed journal are served from it
+    instead of being fetched again.
+
     Args:
         base_url: The API endpoint URL
-        limit: Number of items per page
+        limit: Number of items per page (negotiated when None)
         location: Location filter
         delay: Delay between requests in seconds (to be respectful)
+        workers: Number of concurrent fetchers (1 keeps the sequential crawl)
+        max_rps: Global requests-per-second cap for the concurrent mode
+        session: Session to reuse; a pooled one is created when omitted
+        on_page: Callback invoked after every page; returning True stops the crawl
+        journal: Checkpoint journal to append pages to and resume from
+        collect: Keep results in memory; disable when an ``on_page`` sink
+            (e.g. ``NDJSONWriter``) persists them, to keep memory flat
+        limiter: Rate limiter shared with other crawls (e.g. the shards of
+            ``scrape_sharded``); every page request waits on it
 
     Returns:
-        List of all startup dictionaries
+        List of all startup dictionaries (empty when ``collect`` is False)
     """
     all_startups = []
+    collected = 0
     offset = 0
     total_count = None
-
-    # Headers to mimic browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en',
-        'Referer': 'https://startupbase.uz/en/startups',
-    }
+    if session is None:
+        session = create_session(pool_size=max(workers, 1))
 
     print(f"Starting to scrape startups from {base_url}")
 
+    probes = 0
+    probe_latency = 0.0
+    first_page = None
+    if journal is not None and journal.pages:
+        if journal.location != location:
+            raise ValueError(f"Journal {journal.filename} was written for location={journal.location!r}, "
+                             f"not {location!r}")
+        limit = journal.limit
+        print(f"Resuming from {journal.filename}: {len(journal.pages)} pages already fetched (limit={limit})")
+    if limit is None:
+        with instrumentation.phase('negotiate_page_size'):
+            limit, probes, probe_latency, first_page = negotiate_page_size(session, base_url, location)
+    requests_made = probes
+
     while True:
         # Build request parameters
         params = {
@@ -46,11 +493,25 @@ def scrape_startupbase_api(
 
         try:
             # Make the request
-            print(f"Fetching offset {offset}...", end=" ")
-            response = requests.get(base_url, params=params, headers=headers)
-            response.raise_for_status()
-
-            data = response.json()
+            restored = journal is not None and offset in journal.pages
+            if restored:
+                print(f"Restoring offset {offset} from journal...", end=" ")
+                data = journal.pages[offset]
+            elif offset == 0 and first_page is not None:
+                # The last page-size probe already fetched this page
+                print("Reusing the page-size probe for offset 0...", end=" ")
+                data = first_page
+                restored = True
+                if journal is not None:
+                    journal.record(offset, limit, location, data)
+            else:
+                print(f"Fetching offset {offset}...", end=" ")
+                if limiter is not None:
+                    limiter.wait()
+                data = fetch_page(session, base_url, params)
+                requests_made += 1
+                if journal is not None:
+                    journal.record(offset, limit, location, data)
 
             # Get total count on first request
             if total_count is None:
@@ -63,75 +524,197 @@ def scrape_startupbase_api(
                 print("No more results found.")
                 break
 
-            all_startups.extend(results)
-            print(f"Got {len(results)} startups (Total collected: {len(all_startups)}/{total_count})")
+            collected += len(results)
+            instrumentation.count('startups_fetched', len(results))
+            if collect:
+                all_startups.extend(results)
+            print(f"Got {len(results)} startups (Total collected: {collected}/{total_count})")
+
+            if on_page is not None and on_page(offset, results, total_count):
+                break
 
             # Check if we've reached the end
-            if data.get('next') is None or len(all_startups) >= total_count:
+            if data.get('next') is None or collected >= total_count:
                 print("Reached the end of pagination.")
                 break
 
+            if workers > 1:
+                offsets = list(range(offset + limit, total_count, limit))
+                pending = [o for o in offsets if journal is None or o not in journal.pages]
+                print(f"Fetching {len(pending)} remaining pages with {workers} workers (max {max_rps} req/s)")
+                remaining, received = _fetch_remaining_concurrently(
+                    base_url, offsets, limit, location, session, workers, max_rps,
+                    total_count=total_count, on_page=on_page, journal=journal, collect=collect,
+                    limiter=limiter
+                )
+                all_startups.extend(remaining)
+                collected += received
+                requests_made += len(pending)
+                break
+
             # Move to next page
             offset += limit
 
-            # Be respectful with delay between requests
-            time.sleep(delay)
+            # Be respectful with delay between requests; a restored or reused page made none
+            if not restored:
+                time.sleep(delay)
 
         except requests.exceptions.RequestException as e:
-            print(f"\nError fetching data at offset {offset}: {e}")
+            print(f"\nError fetching data at offset {offset} after retries: {e}")
+            print(f"WARNING: dataset is incomplete ({collected}/{total_count or '?'} startups)")
             break
         except json.JSONDecodeError as e:
             print(f"\nError parsing JSON at offset {offset}: {e}")
             break
 
-    print(f"\nScraping complete! Total startups collected: {len(all_startups)}")
+    print(f"\nScraping complete! Total startups collected: {collected}")
+    if probes and total_count:
+        baseline = math.ceil(total_count / BROWSER_PAGE_SIZE)
+        saved = baseline - requests_made
+        per_request = probe_latency + (0.0 if workers > 1 else delay)
+        print(f"Page size {limit}: {requests_made} requests instead of {baseline} at limit={BROWSER_PAGE_SIZE} "
+              f"(saved {saved} requests, ~{saved * per_request:.1f}s wall-clock)")
     return all_startups
 
 
+def _region_id(startup: Dict) -> Optional[str]:
+    """Location id of a startup's ``region``, or None when it has none."""
+    region = startup.get('region')
+    if region and region.get('id') is not None:
+        return str(region['id'])
+    return None
+
+
+def discover_locations(session: requests.Session, base_url: str, limit: int,
+                       page: Optional[Dict] = None) -> Tuple[List[str], int]:
+    """
+    Discover the location shards to crawl.
+
+    Region ids are collected from the ``region`` objects of the first page
+    of the ``all`` listing (fetched at the negotiated page size unless
+    ``page``, e.g. the last ``negotiate_page_size`` probe, already holds it).
+    Whether they cover the whole catalogue is checked with ``count_locations``.
+
+    Returns:
+        Tuple of (location ids sorted numerically, ``count`` of the ``all`` listing)
+    """
+    data = page if page is not None else fetch_page(
+        session, base_url, {'limit': limit, 'location': 'all', 'offset': 0})
+    regions = {_region_id(startup) for startup in data.get('results', [])} - {None}
+    locations = sorted(regions, key=lambda r: (not r.isdigit(), int(r) if r.isdigit() else 0, r))
+    print(f"Discovered {len(locations)} locations; the 'all' listing reports {data.get('count', 0)} startups")
+    return locations, data.get('count', 0)
+
+
+def count_locations(session: requests.Session, base_url: str, locations: List[str],
+                    limiter: Optional[RateLimiter] = None) -> Dict[str, int]:
+    """Listing ``count`` of each location, read from a one-startup page per location."""
+    counts = {}
+    for location in locations:
+        if limiter is not None:
+            limiter.wait()
+        data = fetch_page(session, base_url, {'limit': 1, 'location': location, 'offset': 0})
+        counts[location] = data.get('count', 0)
+    return counts
+
+
+def scrape_sharded(
+    base_url: str,
+    locations: List[str],
+    limit: int,
+    expected_total: Optional[int] = None,
+    shard_workers: int = 4,
+    delay: float = 0.5,
+    workers: int = 1,
+    max_rps: float = 4.0,
+    session: Optional[requests.Session] = None,
+    on_page: Optional[PageCallback] = None,
+    collect: bool = True,
+    limiter: Optional[RateLimiter] = None
+) -> Tuple[List[Dict], bool]:
+    """
+    Crawl every location shard concurrently and merge them, deduplicated on ``id``.
+
+    Each shard is an independent ``scrape_startupbase_api`` crawl (with its
+    own ``workers``), so up to ``shard_workers`` offset chains progress at
+    once. All of them wait on one ``RateLimiter``, so together they stay
+    under ``max_rps``. Pages are deduplicated under a lock before they reach
+    ``on_page``, which therefore sees every startup once.
+
+    Only startups with a listed location are reachable this way: the API
+    has no filter for startups without a region, so ``_scrape_shards``
+    falls back to crawling the ``all`` listing as a single shard when the
+    location counts do not add up to the catalogue.
+
+    Args:
+        locations: Location ids crawled by this run
+        expected_total: Startups this run should return; the merged count
+            is cross-checked against it
+        limiter: Rate limiter to share with other requests (a ``max_rps``
+            one is created when omitted)
+
+    Returns:
+        Tuple of (list of unique startup dictionaries, empty when ``collect``
+        is False; whether the cross-check passed, False when there was no
+        ``expected_total`` to check against)
+    """
+    if limiter is None:
+        limiter = RateLimiter(max_rps)
+    lock = threading.Lock()
+    seen = set()
+    merged = []
+    complete = threading.Event()
+
+    def dedup(offset: int, results: List[Dict], total_count: int) -> bool:
+        with lock:
+            fresh = [startup for startup in results if startup.get('id') not in seen]
+            seen.update(startup.get('id') for startup in fresh)
+            if collect:
+                merged.extend(fresh)
+            instrumentation.count('shard_duplicates', len(results) - len(fresh))
+            if fresh and on_page is not None:
+                on_page(offset, fresh, total_count)
+            if expected_total is not None and len(seen) >= expected_total:
+                complete.set()
+        return complete.is_set()
+
+    def crawl(location: str):
+        with instrumentation.phase('crawl_shard'):
+            scrape_startupbase_api(base_url=base_url, limit=limit, location=location, delay=delay,
+                                   workers=workers, max_rps=max_rps, session=session, on_page=dedup,
+                                   collect=False, limiter=limiter)
+
+    print(f"Crawling {len(locations)} shards with {shard_workers} concurrent shards (max {max_rps} req/s in total)")
+    with ThreadPoolExecutor(max_workers=shard_workers) as executor:
+        list(executor.map(crawl, locations))
+    print(f"\nShards returned {len(seen)} unique startups")
+
+    if expected_total is not None:
+        gap = expected_total - len(seen)
+        if gap > 0:
+            print(f"WARNING: merged shards hold {len(seen)} of {expected_total} startups ({gap} missing)")
+        else:
+            print(f"Cross-check passed: {len(seen)} unique startups match the expected total of {expected_total}")
+    return merged, expected_total is not None and len(seen) >= expected_total
+
+
 def save_to_csv(data: List[Dict], filename: str = "startups_data.csv"):
-    """Save the scraped data to a CSV file."""
+    """Save the scraped data to a CSV file with the flattened ``FLAT_COLUMNS`` schema."""
     if not data:
         print("No data to save.")
         return
 
-    # Flatten the nested data structure
-    flattened_data = []
-    for startup in data:
-        row = {
-            'id': startup.get('id'),
-            'name': startup.get('name'),
-            'logo': startup.get('logo'),
-            'image': startup.get('image'),
-            'short_description': startup.get('short_description'),
-            'description': startup.get('description'),
-            'industry_id': startup.get('industry', {}).get('id') if startup.get('industry') else None,
-            'industry_name': startup.get('industry', {}).get('name') if startup.get('industry') else None,
-            'stage': startup.get('stage'),
-            'region_id': startup.get('region', {}).get('id') if startup.get('region') else None,
-            'region_name': startup.get('region', {}).get('name') if startup.get('region') else None,
-            'region_country': startup.get('region', {}).get('county') if startup.get('region') else None,
-            'region_lat': startup.get('region', {}).get('lat') if startup.get('region') else None,
-            'region_long': startup.get('region', {}).get('long') if startup.get('region') else None,
-            'is_verified': startup.get('is_verified'),
-            'digital_startup_awards_participant': startup.get('digital_startup_awards_participant'),
-            'is_member': startup.get('is_member'),
-            'tech_awards_winner': startup.get('tech_awards_winner')
-        }
-        flattened_data.append(row)
-
-    # Write to CSV
-    fieldnames = flattened_data[0].keys()
-    with open(filename, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(flattened_data)
-
-    print(f"Data saved to {filename}")
+    with instrumentation.phase('save_csv'):
+        writer = CSVWriter(filename)
+        try:
+            writer.write(data)
+        finally:
+            writer.close()
 
 
 def save_to_json(data: List[Dict], filename: str = "startups_data.json"):
     """Save the scraped data to a JSON file."""
-    with open(filename, 'w', encoding='utf-8') as f:
+    with instrumentation.phase('save_json'), open(filename, 'w', encoding='utf-8') as f:
         json.dump({
             'total_count': len(data),
             'startups': data
@@ -139,49 +722,609 @@ def save_to_json(data: List[Dict], filename: str = "startups_data.json"):
     print(f"Data saved to {filename}")
 
 
-def main():
+def load_from_json(filename: str = "startups_data.json") -> List[Dict]:
+    """Load previously saved startups, or an empty list if the file does not exist."""
+    if not os.path.exists(filename):
+        return []
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f).get('startups', [])
+
+
+def record_hash(startup: Dict) -> str:
+    """Stable content hash of a single startup record."""
+    payload = json.dumps(startup, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def load_state(filename: str = "crawl_state.json") -> Dict[str, str]:
+    """Load the id -> content hash map written by the last incremental run."""
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f).get('records', {})
+
+
+def save_state(data: List[Dict], filename: str = "crawl_state.json"):
+    """Persist the id -> content hash map for the given dataset."""
+    state = {
+        'updated_at': datetime.now(timezone.utc).isoformat(),
+        'records': {str(startup.get('id')): record_hash(startup) for startup in data},
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    print(f"State saved to {filename}")
+
+
+class ChangeTracker:
+    """
+    Classify crawled pages against stored content hashes.
+
+    Passed as ``on_page`` to ``scrape_startupbase_api``; it stops the crawl
+    after ``unchanged_pages`` consecutive pages whose records are all known
+    and identical. On a first run (no stored hashes) it never stops early.
+    """
+
+    def __init__(self, known_hashes: Dict[str, str], unchanged_pages: int = 2):
+        self.known_hashes = known_hashes
+        self.unchanged_pages = unchanged_pages
+        self.unchanged_run = 0
+        self.total_count = None
+        self.stopped_early = False
+        self.seen = set()
+        self.added = []
+        self.changed = []
+
+    def __call__(self, offset: int, results: List[Dict], total_count: int) -> bool:
+        self.total_count = total_count
+        page_changed = False
+        for startup in results:
+            key = str(startup.get('id'))
+            self.seen.add(key)
+            previous = self.known_hashes.get(key)
+            if previous is None:
+                self.added.append(key)
+                page_changed = True
+            elif previous != record_hash(startup):
+                self.changed.append(key)
+                page_changed = True
+
+        self.unchanged_run = 0 if page_changed else self.unchanged_run + 1
+        if self.known_hashes and self.unchanged_run >= self.unchanged_pages:
+            print(f"{self.unchanged_run} unchanged pages in a row, stopping incremental crawl.")
+            self.stopped_early = True
+            return True
+        return False
+
+    @property
+    def complete(self) -> bool:
+        """True when every record reported by the API was seen."""
+        return (not self.stopped_early and self.total_count is not None
+                and len(self.seen) >= self.total_count)
+
+
+def merge_incremental(stored: List[Dict], fetched: List[Dict], tracker: ChangeTracker) -> Tuple[List[Dict], Dict]:
+    """
+    Merge freshly crawled records into the stored dataset.
+
+    Fetched records replace stored ones with the same id. Stored records are
+    only dropped as removed when the crawl covered the whole catalogue,
+    since an early-stopped crawl cannot tell a removal from an unvisited page.
+
+    Returns:
+        Tuple of (merged dataset, report with added/changed/removed ids)
+    """
+    fetched_ids = {str(startup.get('id')) for startup in fetched}
+    removed = []
+    merged = list(fetched)
+    for startup in stored:
+        key = str(startup.get('id'))
+        if key in fetched_ids:
+            continue
+        if tracker.complete:
+            removed.append(key)
+        else:
+            merged.append(startup)
+
+    if not tracker.complete and tracker.total_count is not None and len(merged) > tracker.total_count:
+        print(f"WARNING: {len(merged) - tracker.total_count} stored startups may have been removed upstream; "
+              f"run a full crawl to reconcile.")
+
+    report = {'added': tracker.added, 'changed': tracker.changed, 'removed': removed}
+    return merged, report
+
+
+def load_enriched_ids(filename: str) -> Set:
+    """Ids already present in an enrichment output file (empty if it does not exist yet)."""
+    if not os.path.exists(filename):
+        return set()
+    return {startup.get('id') for startup in iter_startups(filename)}
+
+
+def enrich_startups(
+    startups: Iterable[Dict],
+    session: requests.Session,
+    base_url: str,
+    detail_url: str = DEFAULT_DETAIL_URL,
+    workers: int = 8,
+    max_rps_per_host: float = 4.0,
+    skip_ids: Optional[Set] = None
+) -> Iterator[Dict]:
+    """
+    Fetch the detail page of every startup and yield it merged into the list record.
+
+    Requests run on a bounded worker pool: at most ``2 * workers`` startups
+    are in flight, so the input can be a stream of any length, and merged
+    records are yielded in input order as soon as they are ready. Each host
+    is limited to ``max_rps_per_host`` requests per second.
+
+    Args:
+        startups: List records (e.g. from the crawl or ``iter_startups``)
+        session: Shared session
+        base_url: Listing endpoint, used to format ``detail_url``
+        detail_url: Detail URL template with ``{base_url}`` and ``{id}`` fields
+        workers: Number of concurrent detail requests
+        max_rps_per_host: Requests-per-second cap for each host
+        skip_ids: Ids enriched in an earlier run; these are not fetched again
+
+    Returns:
+        Iterator of list records updated with their detail fields
+    """
+    skip_ids = skip_ids if skip_ids is not None else set()
+    limiter = HostRateLimiter(max_rps_per_host)
+    seen = set()
+    fetched = skipped = failed = 0
+
+    def fetch(startup: Dict):
+        url = detail_url.format(base_url=base_url, id=startup['id'])
+        limiter.wait(url)
+        try:
+            return startup, fetch_page(session, url, {}), None
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            return startup, None, e
+
+    def finish(future):
+        nonlocal fetched, failed
+        startup, detail, error = future.result()
+        if error is not None:
+            failed += 1
+            instrumentation.count('details_failed')
+            print(f"\nError fetching details of startup {startup['id']}: {error}")
+            return None
+        fetched += 1
+        instrumentation.count('details_fetched')
+        if fetched % 100 == 0:
+            print(f"Enriched {fetched} startups")
+        return {**startup, **detail}
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for startup in startups:
+            startup_id = startup.get('id')
+            if startup_id is None or startup_id in skip_ids or startup_id in seen:
+                skipped += 1
+                continue
+            seen.add(startup_id)
+            pending.append(executor.submit(fetch, startup))
+            if len(pending) >= 2 * workers:
+                merged = finish(pending.popleft())
+                if merged is not None:
+                    yield merged
+        while pending:
+            merged = finish(pending.popleft())
+            if merged is not None:
+                yield merged
+
+    print(f"Enrichment complete: {fetched} fetched, {skipped} already enriched or duplicate, {failed} failed")
+
+
+def enrich_to_file(
+    startups: Iterable[Dict],
+    filename: str,
+    session: requests.Session,
+    base_url: str,
+    batch_size: int = 100,
+    **kwargs
+) -> int:
+    """
+    Enrich startups not yet in ``filename`` and append the merged records to it.
+
+    Returns:
+        Number of records appended
+    """
+    skip_ids = load_enriched_ids(filename)
+    if skip_ids:
+        print(f"Skipping {len(skip_ids)} startups already enriched in {filename}")
+    writer = NDJSONWriter(filename, append=True)
+    batch = []
+    try:
+        for merged in enrich_startups(startups, session, base_url, skip_ids=skip_ids, **kwargs):
+            batch.append(merged)
+            if len(batch) >= batch_size:
+                writer(0, batch, 0)
+                batch = []
+        if batch:
+            writer(0, batch, 0)
+    finally:
+        writer.close()
+    return writer.records_written
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the scraper."""
+    parser = argparse.ArgumentParser(description="Scrape startups from the StartupBase.uz API")
+    parser.add_argument('--base-url', default="https://startupbase.uz/api/startups/",
+                        help="API endpoint URL")
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Number of items per page (default: negotiate the largest the API honours)")
+    parser.add_argument('--location', default="all", help="Location filter")
+    parser.add_argument('--delay', type=float, default=0.5,
+                        help="Delay between sequential requests in seconds")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Fetch pages concurrently with this many workers")
+    parser.add_argument('--max-rps', type=float, default=4.0,
+                        help="Global requests-per-second cap when --workers > 1 or with --shards")
+    parser.add_argument('--pool-size', type=int, default=10,
+                        help="Number of pooled keep-alive connections")
+    parser.add_argument('--http-cache', metavar='PATH', default=None,
+                        help="Cache responses in this SQLite file and revalidate them with ETag/Last-Modified")
+    parser.add_argument('--cache-ttl', type=float, default=3600.0,
+                        help="Seconds a cached response is served without revalidation")
+    parser.add_argument('--cache-max-mb', type=float, default=512.0,
+                        help="Evict least recently used responses beyond this size")
+    parser.add_argument('--offline', action='store_true',
+                        help="Replay the crawl from --http-cache without any network access")
+    parser.add_argument('--shards', action='store_true',
+                        help="Discover the region set and crawl each location concurrently, merged on id")
+    parser.add_argument('--shard-workers', type=int, default=4,
+                        help="Location shards crawled at once with --shards")
+    parser.add_argument('--shard-index', type=int, default=0,
+                        help="With --shard-count, the share of locations this machine crawls (0-based)")
+    parser.add_argument('--shard-count', type=int, default=1,
+                        help="Split the locations across this many machines")
+    parser.add_argument('--locations', nargs='+', metavar='ID', default=None,
+                        help="Location ids to shard on instead of discovering them; required with --shard-count")
+    parser.add_argument('--no-remainder', dest='remainder', action='store_false',
+                        help="With --shards, shard anyway and skip the startups without a listed location "
+                             "(e.g. no region) instead of crawling the 'all' listing")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only merge new or changed startups into the stored dataset")
+    parser.add_argument('--state-file', default="crawl_state.json",
+                        help="Content hash store used by --incremental")
+    parser.add_argument('--unchanged-pages', type=int, default=2,
+                        help="Stop an incremental crawl after this many unchanged pages in a row")
+    parser.add_argument('--journal', default="crawl_journal.jsonl",
+                        help="Append-only checkpoint of fetched pages")
+    parser.add_argument('--resume', action='store_true',
+                        help="Resume a crashed crawl, skipping offsets already in the journal")
+    parser.add_argument('--ndjson', default=None,
+                        help="Stream records to this JSON Lines file as pages arrive (.gz/.zst to compress)")
+    parser.add_argument('--csv', default="startups_data.csv",
+                        help="CSV export, written page by page as results arrive (.gz/.zst to compress; "
+                             "'' to skip)")
+    parser.add_argument('--csv-flush-interval', type=float, default=5.0,
+                        help="Seconds between flushes of the CSV while crawling")
+    parser.add_argument('--parquet', default=None,
+                        help="Also export a columnar Parquet file (requires pyarrow)")
+    parser.add_argument('--db', default=None,
+                        help="Upsert records into this SQLite index as pages arrive (see startup_db.py)")
+    parser.add_argument('--snapshots', metavar='PATH', default=None,
+                        help="Append this crawl as a dated snapshot to a history store (see snapshot_store.py)")
+    parser.add_argument('--snapshot-date', default=None,
+                        help="Date of the snapshot added with --snapshots (default: today)")
+    parser.add_argument('--enrich', metavar='PATH', default=None,
+                        help="Fetch each startup's detail page and append merged records to this JSON Lines "
+                             "file; ids already in it are skipped")
+    parser.add_argument('--detail-url', default=DEFAULT_DETAIL_URL,
+                        help="Detail URL template with {base_url} and {id} fields")
+    parser.add_argument('--enrich-workers', type=int, default=8,
+                        help="Concurrent detail requests with --enrich")
+    parser.add_argument('--detail-rps', type=float, default=4.0,
+                        help="Per-host requests-per-second cap for detail requests")
+    parser.add_argument('--report', metavar='PATH',
+                        help="Write a JSON run report with per-phase timings and memory")
+    parser.add_argument('--prometheus', metavar='PATH',
+                        help="Also write the run report as a Prometheus textfile")
+    parser.add_argument('--stream-only', action='store_true',
+                        help="With --ndjson, keep nothing in memory and skip the JSON output")
+    args = parser.parse_args(argv)
+    if args.stream_only and not args.ndjson:
+        parser.error("--stream-only requires --ndjson")
+    if args.stream_only and args.incremental:
+        parser.error("--stream-only cannot be combined with --incremental")
+    if args.offline and not args.http_cache:
+        parser.error("--offline requires --http-cache")
+    if args.shards and (args.incremental or args.resume):
+        parser.error("--shards cannot be combined with --incremental or --resume")
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1")
+    if args.shard_count > 1 and not args.locations:
+        parser.error("--shard-count needs an explicit --locations list, identical on every machine")
+    return args
+
+
+def print_statistics(startups: Iterable[Dict]):
+    """Print stage and industry breakdowns in a single pass over the records."""
+    total = 0
+    stages = {}
+    industries = {}
+    for startup in startups:
+        total += 1
+
+        # Count by stage
+        stage = startup.get('stage', 'Unknown')
+        stages[stage] = stages.get(stage, 0) + 1
+
+        # Count by industry
+        industry = startup.get('industry', {})
+        if industry:
+            industry_name = industry.get('name', 'Unknown')
+            industries[industry_name] = industries.get(industry_name, 0) + 1
+
+    print("\n" + "=" * 60)
+    print("Statistics:")
+    print("=" * 60)
+    print(f"Total startups: {total}")
+
+    print("\nStartups by stage:")
+    for stage, count in sorted(stages.items(), key=lambda x: x[1], reverse=True):
+        print(f"  {stage}: {count}")
+
+    print("\nTop 10 industries:")
+    for industry, count in sorted(industries.items(), key=lambda x: x[1], reverse=True)[:10]:
+        print(f"  {industry}: {count}")
+
+
+def main(argv=None):
     """Main function to run the scraper."""
+    args = parse_args(argv)
+    report = instrumentation.start_run('scrape_startups')
+    try:
+        _run(args)
+    finally:
+        if args.report or args.prometheus:
+            report.print_summary()
+        if args.report:
+            report.write_json(args.report)
+        if args.prometheus:
+            report.write_prometheus(args.prometheus)
+
+
+def _run(args: argparse.Namespace):
+    """Scrape, merge and save according to the parsed options."""
     print("=" * 60)
     print("StartupBase.uz API Scraper")
     print("=" * 60)
 
+    cache = None
+    if args.http_cache:
+        cache = HTTPCache(args.http_cache, ttl=args.cache_ttl, max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                          offline=args.offline)
+    if args.offline:
+        # Replaying from disk: no politeness delays or rate limits needed
+        args.delay = 0.0
+        args.max_rps = 0.0
+        args.detail_rps = 0.0
+        print(f"Offline mode: serving every request from {args.http_cache}")
+    shard_workers = args.shard_workers if args.shards else 1
+    session = create_session(pool_size=max(args.pool_size, args.workers * shard_workers, args.enrich_workers),
+                             cache=cache)
+    try:
+        _crawl(args, session)
+    finally:
+        # Enrichment still goes through the cache after the crawl, so it is closed last
+        if cache is not None:
+            cache.close()
+
+
+def _crawl(args: argparse.Namespace, session: requests.Session):
+    """Crawl the listing into the configured sinks, then export, snapshot and enrich."""
+    tracker = None
+    if args.incremental:
+        tracker = ChangeTracker(load_state(args.state_file), unchanged_pages=args.unchanged_pages)
+
+    # Shards are independent crawls, so there is no single offset chain to journal
+    journal = CrawlJournal(args.journal, resume=args.resume) if not args.shards else None
+    # The streamed exports are staged and only replace the last ones once the crawl proves complete
+    writer = NDJSONWriter(args.ndjson, staged=True) if args.ndjson else None
+    # An incremental crawl only sees changed pages; its CSV is written from the merged data instead.
+    csv_writer = None
+    if args.csv and tracker is None:
+        csv_writer = CSVWriter(args.csv, flush_interval=args.csv_flush_interval, staged=True)
+    db = StartupDB(args.db) if args.db else None
+
     # Scrape the data
-    startups = scrape_startupbase_api()
+    with instrumentation.phase('crawl'):
+        try:
+            if args.shards:
+                startups, complete = _scrape_shards(args, session,
+                                                    on_page=chain_page_callbacks(writer, csv_writer, db))
+            else:
+                startups = scrape_startupbase_api(
+                    base_url=args.base_url,
+                    limit=args.limit,
+                    location=args.location,
+                    delay=args.delay,
+                    workers=args.workers,
+                    max_rps=args.max_rps,
+                    session=session,
+                    on_page=chain_page_callbacks(tracker, writer, csv_writer, db),
+                    journal=journal,
+                    collect=not args.stream_only
+                )
+                journal.close()
+                complete = journal.complete or (tracker is not None and tracker.stopped_early)
+        finally:
+            # Close the sinks even on Ctrl-C so a partial crawl leaves readable files
+            if writer is not None:
+                writer.close()
+            if csv_writer is not None:
+                csv_writer.close()
+        if db is not None:
+            print(f"Upserted {db.records_upserted} startups into {args.db}")
+            db.close()
+
+    if args.stream_only:
+        if writer.records_written:
+            if journal is not None and journal.complete:
+                journal.discard()
+            elif journal is not None:
+                print(f"Crawl incomplete; keeping {args.journal} (rerun with --resume to continue)")
+            if not complete:
+                _keep_exports(writer, csv_writer)
+            else:
+                writer.commit()
+                if csv_writer is not None:
+                    csv_writer.commit()
+                if args.parquet:
+                    save_to_parquet(iter_startups(writer.filename), args.parquet)
+            # An incomplete crawl is read back from its staged file
+            streamed = writer.filename if complete else writer.path
+            print_statistics(iter_startups(streamed))
+            if args.snapshots:
+                _snapshot(args, iter_startups(streamed), complete=complete)
+            if args.enrich:
+                _enrich(args, session, iter_startups(streamed))
+        else:
+            print("No data was scraped.")
+        return
+
+    if tracker is not None and startups:
+        startups, report = merge_incremental(load_from_json(), startups, tracker)
+        print(f"\nIncremental update: {len(report['added'])} added, "
+              f"{len(report['changed'])} changed, {len(report['removed'])} removed")
+        for label in ('added', 'changed', 'removed'):
+            if report[label]:
+                print(f"  {label}: {', '.join(report[label][:20])}"
+                      f"{' ...' if len(report[label]) > 20 else ''}")
 
     if startups:
-        # Save to CSV and JSON files
-        save_to_csv(startups)
-        save_to_json(startups)
+        # Save to CSV and JSON files. An incremental crawl is merged into the stored
+        # dataset, but a full one that stopped short would drop every startup it missed.
+        if not complete and tracker is None:
+            _keep_exports(writer, csv_writer)
+        else:
+            if writer is None:
+                pass
+            elif complete:
+                writer.commit()
+            else:
+                # An incremental crawl stopped short: only the merged dataset is trusted
+                _keep_exports(writer)
+            if csv_writer is not None:
+                csv_writer.commit()
+            elif args.csv:
+                save_to_csv(startups, args.csv)
+            save_to_json(startups)
+            if args.parquet:
+                save_to_parquet(startups, args.parquet)
+        if tracker is not None:
+            save_state(startups, args.state_file)
+        if journal is None:
+            pass
+        elif complete:
+            journal.discard()
+        else:
+            print(f"Crawl incomplete; keeping {args.journal} (rerun with --resume to continue)")
 
-        # Print some statistics
-        print("\n" + "=" * 60)
-        print("Statistics:")
-        print("=" * 60)
-        print(f"Total startups: {len(startups)}")
+        print_statistics(startups)
+        if args.snapshots:
+            _snapshot(args, startups, complete=complete)
+        if args.enrich:
+            _enrich(args, session, startups)
+    else:
+        print("No data was scraped.")
 
-        # Count by stage
-        stages = {}
-        for startup in startups:
-            stage = startup.get('stage', 'Unknown')
-            stages[stage] = stages.get(stage, 0) + 1
 
-        print("\nStartups by stage:")
-        for stage, count in sorted(stages.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {stage}: {count}")
+def _scrape_shards(args: argparse.Namespace, session: requests.Session,
+                   on_page: Optional[PageCallback]) -> Tuple[List[Dict], bool]:
+    """
+    Resolve the locations, pick this machine's share and crawl them as shards.
 
-        # Count by industry
-        industries = {}
-        for startup in startups:
-            industry = startup.get('industry', {})
-            if industry:
-                industry_name = industry.get('name', 'Unknown')
-                industries[industry_name] = industries.get(industry_name, 0) + 1
-
-        print("\nTop 10 industries:")
-        for industry, count in sorted(industries.items(), key=lambda x: x[1], reverse=True)[:10]:
-            print(f"  {industry}: {count}")
+    Returns:
+        Tuple of (startups, whether they passed the cross-check)
+
+    Raises:
+        SystemExit: When a multi-machine split cannot cover the catalogue
+    """
+    limit = args.limit
+    first_page = None
+    if limit is None:
+        with instrumentation.phase('negotiate_page_size'):
+            limit, _, _, first_page = negotiate_page_size(session, args.base_url)
+    limiter = RateLimiter(args.max_rps)
+
+    if args.locations:
+        locations = list(dict.fromkeys(args.locations))
+        all_count = count_locations(session, args.base_url, ['all'], limiter)['all']
     else:
-        print("No data was scraped.")
+        locations, all_count = discover_locations(session, args.base_url, limit, first_page)
+    counts = count_locations(session, args.base_url, locations, limiter)
+    unassigned = all_count - sum(counts.values())
+    if unassigned < 0:
+        print(f"WARNING: the locations report {-unassigned} more startups than the 'all' listing "
+              f"({all_count}); the cross-check may fail")
+        unassigned = 0
+
+    crawl = dict(base_url=args.base_url, limit=limit, shard_workers=args.shard_workers, delay=args.delay,
+                 workers=args.workers, max_rps=args.max_rps, session=session, on_page=on_page,
+                 collect=not args.stream_only, limiter=limiter)
+    if unassigned and args.remainder:
+        # The API cannot filter on "no region", so only the full 'all' listing reaches these
+        # startups; crawling it next to the location shards would fetch most records twice
+        message = (f"{unassigned} of {all_count} startups are outside locations {', '.join(locations)} "
+                   f"(no region, or a region not discovered) and only the full 'all' listing returns them")
+        if args.shard_count > 1:
+            raise SystemExit(f"ERROR: {message}, so the crawl cannot be split across machines. "
+                             f"Run one unsharded crawl, or pass --no-remainder to skip them.")
+        print(f"WARNING: {message}; sharding cannot save requests, crawling the 'all' listing instead "
+              f"with {max(args.workers, args.shard_workers)} workers")
+        crawl.update(shard_workers=1, workers=max(args.workers, args.shard_workers))
+        return scrape_sharded(locations=['all'], expected_total=all_count, **crawl)
+
+    if unassigned:
+        print(f"WARNING: {unassigned} startups are outside the listed locations and are skipped "
+              f"(--no-remainder); the output will not hold the whole catalogue")
+    mine = locations[args.shard_index::args.shard_count]
+    expected_total = sum(counts[location] for location in mine)
+    if args.shard_count > 1:
+        print(f"Shard {args.shard_index + 1}/{args.shard_count} of locations {', '.join(locations)}: "
+              f"crawling {', '.join(mine) or 'no locations'} ({expected_total} startups)")
+    return scrape_sharded(locations=mine, expected_total=expected_total, **crawl)
+
+
+def _keep_exports(*writers: Optional[Union[NDJSONWriter, CSVWriter]]):
+    """Leave the last complete exports in place after an incomplete crawl."""
+    print("WARNING: crawl incomplete; the previous exports were left in place")
+    for writer in writers:
+        if writer is not None:
+            print(f"The startups received are in {writer.path}")
+
+
+def _snapshot(args: argparse.Namespace, startups: Iterable[Dict], complete: bool):
+    """Append the crawl to the snapshot history store."""
+    # A slice of a multi-machine sharded crawl, or one run with --no-remainder,
+    # may not cover the whole catalogue
+    complete = complete and not (args.shards and (args.shard_count > 1 or not args.remainder))
+    with SnapshotStore(args.snapshots) as store:
+        try:
+            stats = store.add_snapshot(startups, args.snapshot_date, complete=complete)
+        except ValueError as e:
+            print(f"WARNING: snapshot not stored: {e}")
+            return
+    print(f"Snapshot {stats['taken_at']} stored in {args.snapshots}: {stats['added']} added, "
+          f"{stats['changed']} changed, {stats['removed']} removed")
+    if not complete:
+        print("Crawl incomplete; startups missing from it were not recorded as removed")
+
+
+def _enrich(args: argparse.Namespace, session: requests.Session, startups: Iterable[Dict]):
+    """Run the detail-page enrichment stage over the crawled startups."""
+    print("\n" + "=" * 60)
+    print("Enriching startups from their detail pages")
+    print("=" * 60)
+    with instrumentation.phase('enrich'):
+        enrich_to_file(startups, args.enrich, session, args.base_url, detail_url=args.detail_url,
+                       workers=args.enrich_workers, max_rps_per_host=args.detail_rps)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,478 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+import zlib
+from datetime import date
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import instrumentation
+from startup_io import BOOLEAN_COLUMNS, iter_startups
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL UNIQUE,
+    records INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    changed INTEGER NOT NULL,
+    removed INTEGER NOT NULL,
+    complete INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS industry (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS region (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    startup_id INTEGER NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    present INTEGER NOT NULL,
+    stage TEXT,
+    industry_id INTEGER,
+    region_id INTEGER,
+    is_verified INTEGER NOT NULL DEFAULT 0,
+    digital_startup_awards_participant INTEGER NOT NULL DEFAULT 0,
+    is_member INTEGER NOT NULL DEFAULT 0,
+    tech_awards_winner INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (startup_id, snapshot_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_state_snapshot ON state(snapshot_id);
+CREATE TABLE IF NOT EXISTS record (
+    startup_id INTEGER NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    body BLOB,
+    PRIMARY KEY (startup_id, snapshot_id)
+);
+CREATE TABLE IF NOT EXISTS tally (
+    snapshot_id INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    value,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tally_field ON tally(field, snapshot_id);
+CREATE TABLE IF NOT EXISTS latest (
+    startup_id INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL,
+    present INTEGER NOT NULL,
+    stage TEXT,
+    industry_id INTEGER,
+    region_id INTEGER,
+    is_verified INTEGER NOT NULL DEFAULT 0,
+    digital_startup_awards_participant INTEGER NOT NULL DEFAULT 0,
+    is_member INTEGER NOT NULL DEFAULT 0,
+    tech_awards_winner INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Columns tracked in ``state``, the ones trends and transitions are computed over
+STATE_COLUMNS = ['stage', 'industry_id', 'region_id'] + list(BOOLEAN_COLUMNS)
+
+# Fields accepted by trend() and transitions(), with the state column they read (in STATE_COLUMNS order)
+TREND_FIELDS = {'stage': 'stage', 'industry': 'industry_id', 'region': 'region_id',
+                **{flag: flag for flag in BOOLEAN_COLUMNS}}
+
+# Labels for "no value" and for startups missing from one side of a transition
+NONE_LABEL = '(none)'
+ABSENT_LABEL = '(absent)'
+
+# Startups looked up in ``latest`` per query while ingesting
+BATCH_SIZE = 500
+
+_INSERT_STATE = (
+    f"INSERT INTO state (startup_id, snapshot_id, present, {', '.join(STATE_COLUMNS)}) "
+    f"VALUES (?, ?, ?, {', '.join('?' * len(STATE_COLUMNS))})"
+)
+_UPSERT_LATEST = (
+    f"INSERT OR REPLACE INTO latest (startup_id, digest, present, {', '.join(STATE_COLUMNS)}) "
+    f"VALUES (?, ?, ?, {', '.join('?' * len(STATE_COLUMNS))})"
+)
+
+
+def _encode(startup: Dict) -> bytes:
+    return json.dumps(startup, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _state_of(startup: Dict) -> Tuple:
+    """The tracked column values of one record, in ``STATE_COLUMNS`` order."""
+    industry = startup.get('industry') or {}
+    region = startup.get('region') or {}
+    return (startup.get('stage'), industry.get('id'), region.get('id'),
+            *(int(bool(startup.get(flag))) for flag in BOOLEAN_COLUMNS))
+
+
+class SnapshotStore:
+    """
+    Append-only history of crawls, one dated snapshot per crawl.
+
+    A snapshot stores only what changed since the previous one, per startup
+    ``id``: a new or changed record is kept as a zlib-compressed JSON body in
+    ``record``, and when its stage, industry, region or status flags change
+    (or it appears or disappears) a compact row is added to ``state``.
+    Unchanged startups cost nothing, so hundreds of daily snapshots of a
+    slowly changing catalogue stay close to the size of one export.
+
+    Queries never decompress records. Per-value counts of the tracked
+    fields are carried forward from the deltas into ``tally`` as each
+    snapshot is added, so a trend is a single indexed read. Transitions use
+    ``state``: the state at any snapshot is the latest row per startup at or
+    before it.
+    """
+
+    def __init__(self, filename: str = "snapshots.db"):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def add_snapshot(self, startups: Iterable[Dict], taken_at: Optional[str] = None,
+                     complete: bool = True) -> Dict:
+        """
+        Append a crawl as the snapshot dated ``taken_at`` (today by default).
+
+        Records are deduplicated on ``id`` (the first copy wins) and diffed
+        against the latest stored version of each startup. Startups missing
+        from the crawl are recorded as removed only when ``complete`` is set,
+        so a partial crawl never looks like a mass removal.
+
+        Args:
+            startups: Records of the crawl, e.g. ``iter_startups(filename)``
+            taken_at: ISO date of the crawl; must be later than every stored snapshot
+            complete: Whether the crawl covered the whole catalogue
+
+        Returns:
+            Dictionary with the snapshot date and its records, added, changed
+            and removed counts
+
+        Raises:
+            ValueError: If ``taken_at`` is not later than the last snapshot
+        """
+        taken_at = taken_at or date.today().isoformat()
+        last = self.conn.execute("SELECT MAX(taken_at) FROM snapshot").fetchone()[0]
+        if last is not None and taken_at <= last:
+            raise ValueError(f"Snapshot {taken_at} is not later than the last stored snapshot ({last}); "
+                             f"the store is append-only")
+
+        stats = {'taken_at': taken_at, 'records': 0, 'added': 0, 'changed': 0, 'removed': 0}
+        seen = set()
+        # (field, value) -> change in the number of present startups since the previous snapshot
+        tally = Counter()
+        with instrumentation.phase('snapshot_add'), self.conn:
+            snapshot_id = self.conn.execute(
+                "INSERT INTO snapshot (taken_at, records, added, changed, removed, complete, created_at) "
+                "VALUES (?, 0, 0, 0, 0, ?, ?)", (taken_at, int(complete), time.time())
+            ).lastrowid
+
+            batch = []
+            for startup in startups:
+                startup_id = startup.get('id')
+                if startup_id is None or startup_id in seen:
+                    continue
+                seen.add(startup_id)
+                batch.append(startup)
+                if len(batch) >= BATCH_SIZE:
+                    self._add_batch(snapshot_id, batch, stats, tally)
+                    batch = []
+            if batch:
+                self._add_batch(snapshot_id, batch, stats, tally)
+
+            if complete:
+                removed = []
+                for startup_id, *state in self.conn.execute(
+                        f"SELECT startup_id, {', '.join(STATE_COLUMNS)} FROM latest WHERE present = 1"):
+                    if startup_id not in seen:
+                        removed.append(startup_id)
+                        tally.subtract(zip(TREND_FIELDS, state))
+                self.conn.executemany(
+                    f"INSERT INTO state (startup_id, snapshot_id, present, {', '.join(STATE_COLUMNS)}) "
+                    f"SELECT startup_id, ?, 0, {', '.join(STATE_COLUMNS)} FROM latest WHERE startup_id = ?",
+                    ((snapshot_id, startup_id) for startup_id in removed)
+                )
+                self.conn.executemany("INSERT INTO record (startup_id, snapshot_id, body) VALUES (?, ?, NULL)",
+                                      ((startup_id, snapshot_id) for startup_id in removed))
+                self.conn.executemany("UPDATE latest SET present = 0 WHERE startup_id = ?",
+                                      ((startup_id,) for startup_id in removed))
+                stats['removed'] = len(removed)
+
+            self._write_tally(snapshot_id, tally)
+            self.conn.execute(
+                "UPDATE snapshot SET records = ?, added = ?, changed = ?, removed = ? WHERE id = ?",
+                (stats['records'], stats['added'], stats['changed'], stats['removed'], snapshot_id)
+            )
+        instrumentation.count('snapshot_records_stored', stats['added'] + stats['changed'])
+        return stats
+
+    def _add_batch(self, snapshot_id: int, startups: List[Dict], stats: Dict, tally: Counter):
+        """Diff a batch of deduplicated records against ``latest`` and store the changes."""
+        ids = [startup['id'] for startup in startups]
+        placeholders = ", ".join("?" * len(ids))
+        previous = {row[0]: row[1:] for row in self.conn.execute(
+            f"SELECT startup_id, digest, present, {', '.join(STATE_COLUMNS)} FROM latest "
+            f"WHERE startup_id IN ({placeholders})", ids
+        )}
+
+        industries = {}
+        regions = {}
+        states = []
+        records = []
+        latest = []
+        for startup in startups:
+            body = _encode(startup)
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            old = previous.get(startup['id'])
+            if old is not None and old[0] == digest and old[1]:
+                continue
+            state = _state_of(startup)
+
+            if old is None or not old[1]:
+                stats['added'] += 1
+            else:
+                stats['changed'] += 1
+            if old is None or not old[1] or tuple(old[2:]) != state:
+                states.append((startup['id'], snapshot_id, 1, *state))
+                tally.update(zip(TREND_FIELDS, state))
+                if old is not None and old[1]:
+                    tally.subtract(zip(TREND_FIELDS, old[2:]))
+            records.append((startup['id'], snapshot_id, zlib.compress(body, 9)))
+            latest.append((startup['id'], digest, 1, *state))
+
+            industry = startup.get('industry') or {}
+            region = startup.get('region') or {}
+            if industry.get('id') is not None:
+                industries[industry['id']] = (industry['id'], industry.get('name') or '')
+            if region.get('id') is not None:
+                regions[region['id']] = (region['id'], region.get('name') or '')
+
+        self.conn.executemany("INSERT OR REPLACE INTO industry (id, name) VALUES (?, ?)", industries.values())
+        self.conn.executemany("INSERT OR REPLACE INTO region (id, name) VALUES (?, ?)", regions.values())
+        self.conn.executemany(_INSERT_STATE, states)
+        self.conn.executemany("INSERT INTO record (startup_id, snapshot_id, body) VALUES (?, ?, ?)", records)
+        self.conn.executemany(_UPSERT_LATEST, latest)
+        stats['records'] += len(startups)
+
+    def _write_tally(self, snapshot_id: int, changes: Counter):
+        """Store the per-value counts of every trend field: the previous snapshot's plus ``changes``."""
+        counts = Counter()
+        previous = self.conn.execute("SELECT MAX(id) FROM snapshot WHERE id < ?", (snapshot_id,)).fetchone()[0]
+        if previous is not None:
+            for field, value, count in self.conn.execute(
+                    "SELECT field, value, count FROM tally WHERE snapshot_id = ?", (previous,)):
+                counts[(field, value)] = count
+        counts.update(changes)
+        self.conn.executemany(
+            "INSERT INTO tally (snapshot_id, field, value, count) VALUES (?, ?, ?, ?)",
+            ((snapshot_id, field, value, count) for (field, value), count in counts.items() if count)
+        )
+
+    def snapshots(self) -> List[Dict]:
+        """Every snapshot with its counts, oldest first."""
+        cursor = self.conn.execute(
+            "SELECT taken_at, records, added, changed, removed, complete FROM snapshot ORDER BY id")
+        return [{'taken_at': taken_at, 'records': records, 'added': added, 'changed': changed,
+                 'removed': removed, 'complete': bool(complete)}
+                for taken_at, records, added, changed, removed, complete in cursor]
+
+    def _snapshot_id(self, taken_at: str) -> int:
+        row = self.conn.execute("SELECT id FROM snapshot WHERE taken_at = ?", (taken_at,)).fetchone()
+        if row is None:
+            raise ValueError(f"No snapshot dated {taken_at} in {self.filename}")
+        return row[0]
+
+    def iter_snapshot(self, taken_at: str) -> Iterator[Dict]:
+        """Yield the full records of the catalogue as of a snapshot, by id."""
+        snapshot_id = self._snapshot_id(taken_at)
+        cursor = self.conn.execute(
+            "SELECT startup_id, MAX(snapshot_id), body FROM record WHERE snapshot_id <= ? "
+            "GROUP BY startup_id ORDER BY startup_id", (snapshot_id,)
+        )
+        for _, _, body in cursor:
+            if body is not None:
+                yield json.loads(zlib.decompress(body))
+
+    def history(self, startup_id: int) -> List[Dict]:
+        """Every stored version of one startup as ``{'taken_at', 'record'}``; removals have record None."""
+        cursor = self.conn.execute(
+            "SELECT sn.taken_at, r.body FROM record r JOIN snapshot sn ON sn.id = r.snapshot_id "
+            "WHERE r.startup_id = ? ORDER BY r.snapshot_id", (startup_id,)
+        )
+        return [{'taken_at': taken_at, 'record': json.loads(zlib.decompress(body)) if body is not None else None}
+                for taken_at, body in cursor]
+
+    def _labels(self, field: str, values) -> List[str]:
+        """Display labels for raw state values: industry and region names, yes/no for flags."""
+        import pandas as pd
+
+        if field == 'industry':
+            names = dict(self.conn.execute("SELECT id, name FROM industry"))
+        elif field == 'region':
+            names = dict(self.conn.execute("SELECT id, name FROM region"))
+        elif field in BOOLEAN_COLUMNS:
+            names = {0: 'no', 1: 'yes'}
+        else:
+            names = {}
+        return [NONE_LABEL if pd.isna(value) else str(names.get(value, value)) for value in values]
+
+    def trend(self, field: str = 'stage'):
+        """
+        Number of startups per value of ``field`` in every snapshot.
+
+        Read from ``tally``, the per-value counts kept up to date from the
+        deltas as each snapshot is added, so the cost depends on the number
+        of snapshots and values, not on the size of the catalogue.
+
+        Returns:
+            DataFrame indexed by snapshot date with one column per value
+        """
+        import pandas as pd
+
+        if field not in TREND_FIELDS:
+            raise ValueError(f"Unknown trend field {field!r}; expected one of {', '.join(TREND_FIELDS)}")
+        sql = """
+            SELECT s.taken_at, t.value, t.count
+            FROM snapshot s LEFT JOIN tally t ON t.snapshot_id = s.id AND t.field = ?
+            ORDER BY s.id
+        """
+        with instrumentation.phase('snapshot_trend'):
+            rows = pd.read_sql_query(sql, self.conn, params=(field,))
+            dates = pd.unique(rows['taken_at'])
+            rows = rows[rows['count'].notna()]
+            rows = rows.assign(value=self._labels(field, rows['value']))
+            counts = rows.pivot_table(index='taken_at', columns='value', values='count', aggfunc='sum')
+            counts = counts.reindex(dates).fillna(0).astype(int)
+            counts.index.name = 'taken_at'
+            counts.columns.name = field
+            if len(counts):
+                # Largest values in the latest snapshot first
+                counts = counts[counts.iloc[-1].sort_values(ascending=False, kind='stable').index]
+        return counts
+
+    def _state_at(self, snapshot_id: int, column: str):
+        import pandas as pd
+
+        sql = f"""
+            SELECT startup_id, MAX(snapshot_id) AS snapshot_id, present, {column} AS value
+            FROM state WHERE snapshot_id <= ? GROUP BY startup_id
+        """
+        return pd.read_sql_query(sql, self.conn, params=(snapshot_id,), index_col='startup_id')
+
+    def transitions(self, start: str, end: str, field: str = 'stage'):
+        """
+        Cross-tabulate where startups were at ``start`` against where they are at ``end``.
+
+        Rows are the values of ``field`` at ``start`` and columns the values
+        at ``end``; startups that did not exist yet, or were removed, show
+        up under ``(absent)``. Reading one row is a cohort: e.g. the
+        ``seed_`` row says how many seed-stage startups reached ``early_a``.
+
+        Returns:
+            DataFrame of startup counts
+        """
+        import pandas as pd
+
+        column = TREND_FIELDS[field]
+
+        def label(frame: pd.DataFrame) -> pd.Series:
+            values = pd.Series(self._labels(field, frame['value']), index=frame.index, dtype=object)
+            return values.where(frame['present'] == 1, ABSENT_LABEL)
+
+        with instrumentation.phase('snapshot_transitions'):
+            before = label(self._state_at(self._snapshot_id(start), column))
+            after = label(self._state_at(self._snapshot_id(end), column))
+            before = before.reindex(after.index.union(before.index), fill_value=ABSENT_LABEL)
+            after = after.reindex(before.index, fill_value=ABSENT_LABEL)
+            # Startups that came and went between the two snapshots are in neither
+            seen = (before != ABSENT_LABEL) | (after != ABSENT_LABEL)
+            moved = pd.crosstab(before[seen].rename(start), after[seen].rename(end))
+        return moved
+
+    def close(self):
+        """Refresh the planner statistics and close the connection."""
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def plot_trend(counts, filename: str, top: int = 8):
+    """Render a trend frame as a line chart of its ``top`` largest series."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    counts.iloc[:, :top].plot(ax=ax, linewidth=2, marker='o' if len(counts) <= 30 else None)
+    ax.set_xlabel('Snapshot')
+    ax.set_ylabel('Startups')
+    ax.set_title(f'Startups by {counts.columns.name} over time', fontsize=16, fontweight='bold', pad=20)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.0, 1.0))
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the snapshot tool."""
+    parser = argparse.ArgumentParser(description="Store dated crawl snapshots and analyse trends across them")
+    parser.add_argument('database', nargs='?', default='snapshots.db', help="Snapshot store file")
+    parser.add_argument('--add', metavar='FILE',
+                        help="Append a .json/.jsonl export as a new snapshot before querying")
+    parser.add_argument('--date', default=None, help="Date of the snapshot added with --add (default: today)")
+    parser.add_argument('--partial', action='store_true',
+                        help="The --add export is an incomplete crawl; do not record missing startups as removed")
+    parser.add_argument('--trend', metavar='FIELD', choices=list(TREND_FIELDS),
+                        help=f"Print startups per value of FIELD in every snapshot ({', '.join(TREND_FIELDS)})")
+    parser.add_argument('--chart', metavar='PNG', help="With --trend, also render the trend as a line chart")
+    parser.add_argument('--transitions', nargs=2, metavar=('FROM', 'TO'),
+                        help="Cross-tabulate values of --field between two snapshot dates")
+    parser.add_argument('--field', default='stage', choices=list(TREND_FIELDS),
+                        help="Field for --transitions (default: stage)")
+    parser.add_argument('--history', type=int, metavar='ID', help="Print every stored version of one startup")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Add snapshots to the store or query it from the command line."""
+    args = parse_args(argv)
+    with SnapshotStore(args.database) as store:
+        if args.add:
+            stats = store.add_snapshot(iter_startups(args.add), args.date, complete=not args.partial)
+            print(f"Snapshot {stats['taken_at']}: {stats['records']} startups, {stats['added']} added, "
+                  f"{stats['changed']} changed, {stats['removed']} removed", file=sys.stderr)
+
+        started = time.perf_counter()
+        counts = None
+        if args.trend:
+            counts = store.trend(args.trend)
+            print(counts.to_string())
+        elif args.transitions:
+            print(store.transitions(*args.transitions, field=args.field).to_string())
+        elif args.history is not None:
+            for version in store.history(args.history):
+                record = version['record']
+                print(f"{version['taken_at']}  " + ("removed" if record is None else
+                                                    f"{record.get('name')} [{record.get('stage') or '-'}]"))
+        elif not args.add:
+            for snapshot in store.snapshots():
+                print(f"{snapshot['taken_at']}  {snapshot['records']:>8} startups  +{snapshot['added']} "
+                      f"~{snapshot['changed']} -{snapshot['removed']}"
+                      + ("" if snapshot['complete'] else "  (partial)"))
+        print(f"Query took {(time.perf_counter() - started) * 1000:.2f} ms", file=sys.stderr)
+        if counts is not None and args.chart:
+            plot_trend(counts, args.chart)
+            print(f"Saved {args.chart}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,522 @@
+import argparse
+import math
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import instrumentation
+from startup_io import BOOLEAN_COLUMNS, _to_float, iter_startups
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS industry (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS region (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    country TEXT,
+    lat REAL,
+    long REAL
+);
+CREATE TABLE IF NOT EXISTS startup (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    logo TEXT,
+    image TEXT,
+    short_description TEXT,
+    description TEXT,
+    industry_id INTEGER REFERENCES industry(id),
+    stage TEXT,
+    region_id INTEGER REFERENCES region(id),
+    is_verified INTEGER NOT NULL DEFAULT 0,
+    digital_startup_awards_participant INTEGER NOT NULL DEFAULT 0,
+    is_member INTEGER NOT NULL DEFAULT 0,
+    tech_awards_winner INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_industry_name ON industry(name);
+CREATE INDEX IF NOT EXISTS idx_region_name ON region(name);
+CREATE INDEX IF NOT EXISTS idx_startup_stage ON startup(stage);
+CREATE INDEX IF NOT EXISTS idx_startup_industry ON startup(industry_id);
+CREATE INDEX IF NOT EXISTS idx_startup_region ON startup(region_id);
+CREATE INDEX IF NOT EXISTS idx_startup_verified ON startup(is_verified);
+CREATE INDEX IF NOT EXISTS idx_startup_awards ON startup(digital_startup_awards_participant);
+CREATE INDEX IF NOT EXISTS idx_startup_member ON startup(is_member);
+CREATE INDEX IF NOT EXISTS idx_startup_winner ON startup(tech_awards_winner);
+"""
+
+# Full-text index over the startup text columns. It is an external-content
+# FTS5 table (the text lives only in ``startup``), kept in step by triggers so
+# every upsert indexes incrementally; unchanged text is not re-indexed.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS startup_fts USING fts5(
+    name, short_description, description,
+    content='startup', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS startup_fts_insert AFTER INSERT ON startup BEGIN
+    INSERT INTO startup_fts (rowid, name, short_description, description)
+    VALUES (new.id, new.name, new.short_description, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS startup_fts_delete AFTER DELETE ON startup BEGIN
+    INSERT INTO startup_fts (startup_fts, rowid, name, short_description, description)
+    VALUES ('delete', old.id, old.name, old.short_description, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS startup_fts_update AFTER UPDATE OF name, short_description, description ON startup
+WHEN old.name IS NOT new.name OR old.short_description IS NOT new.short_description
+     OR old.description IS NOT new.description
+BEGIN
+    INSERT INTO startup_fts (startup_fts, rowid, name, short_description, description)
+    VALUES ('delete', old.id, old.name, old.short_description, old.description);
+    INSERT INTO startup_fts (rowid, name, short_description, description)
+    VALUES (new.id, new.name, new.short_description, new.description);
+END;
+"""
+
+# BM25 column weights: a match in the name outranks one in the short
+# description, which outranks one in the long description
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Matches scored per search. FTS5's bm25() reads the whole posting list of
+# every term to weigh it, which costs tens of milliseconds for common words
+# at 1M records; searches are instead scored from the text of their newest
+# RANK_WINDOW matches, so their cost is bounded however common the words are
+RANK_WINDOW = 100
+
+# Newest matches read to weigh a term: rarer terms get their exact document
+# frequency, commoner ones an estimate from how densely they occur
+DF_SAMPLE = 500
+
+# Token characters of the unicode61 tokenizer: letters and digits
+_TOKEN_CHAR = r'[^\W_]'
+
+STARTUP_COLUMNS = [
+    'id', 'name', 'logo', 'image', 'short_description', 'description',
+    'industry_id', 'stage', 'region_id',
+    'is_verified', 'digital_startup_awards_participant', 'is_member', 'tech_awards_winner',
+    'updated_at',
+]
+
+_UPSERT_STARTUP = (
+    f"INSERT INTO startup ({', '.join(STARTUP_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in STARTUP_COLUMNS)}) "
+    f"ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in STARTUP_COLUMNS[1:])
+)
+_UPSERT_INDUSTRY = "INSERT INTO industry (id, name) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET name = excluded.name"
+_UPSERT_REGION = (
+    "INSERT INTO region (id, name, country, lat, long) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, country = excluded.country, "
+    "lat = excluded.lat, long = excluded.long"
+)
+
+# Denormalized view in the startups_data.json shape, minus the nesting
+_SELECT_STARTUPS = """
+SELECT s.id, s.name, s.short_description, i.name AS industry_name, s.stage, r.name AS region_name,
+       s.is_verified, s.digital_startup_awards_participant, s.is_member, s.tech_awards_winner
+FROM startup s
+LEFT JOIN industry i ON i.id = s.industry_id
+LEFT JOIN region r ON r.id = s.region_id
+"""
+
+_SELECT_SEARCH_RESULTS = """
+SELECT s.id, s.name, s.short_description, i.name AS industry_name, s.stage, r.name AS region_name,
+       s.is_verified, s.digital_startup_awards_participant, s.is_member, s.tech_awards_winner,
+       snippet(startup_fts, -1, '[', ']', '...', 10) AS snippet, s.description
+FROM startup_fts
+CROSS JOIN startup s ON s.id = startup_fts.rowid
+LEFT JOIN industry i ON i.id = s.industry_id
+LEFT JOIN region r ON r.id = s.region_id
+"""
+
+
+def is_database(filename: str) -> bool:
+    """True for SQLite index files."""
+    return filename.endswith(('.db', '.sqlite', '.sqlite3'))
+
+
+def _row_to_dict(row: sqlite3.Row) -> Dict:
+    return {k: (bool(row[k]) if k in BOOLEAN_COLUMNS else row[k]) for k in row.keys()}
+
+
+def match_expression(text: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches every word.
+
+    Words are quoted so punctuation and FTS operators in user input are
+    searched literally; a trailing ``*`` is kept as a prefix match.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    if not terms:
+        raise ValueError("Search text is empty")
+    return " ".join(terms)
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip diacritics, like the ``remove_diacritics`` tokenizer option."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def _term_pattern(word: str, prefix: bool) -> Optional[re.Pattern]:
+    """
+    Regex finding one search term in folded text.
+
+    The start of a token is checked by ``_occurrences`` rather than with a
+    lookbehind, which would stop ``re`` from scanning for the literal.
+    """
+    tokens = re.findall(f'{_TOKEN_CHAR}+', _fold(word))
+    if not tokens:
+        return None
+    body = r'[\W_]+'.join(re.escape(token) for token in tokens)
+    return re.compile(body + ('' if prefix else f'(?!{_TOKEN_CHAR})'))
+
+
+def _occurrences(pattern: re.Pattern, text: str) -> int:
+    """Number of matches of ``pattern`` that start a token of ``text``."""
+    found = 0
+    for match in pattern.finditer(text):
+        start = match.start()
+        if not start or not text[start - 1].isalnum():
+            found += 1
+    return found
+
+
+def _split_terms(text: str) -> List[Tuple[str, bool]]:
+    """(word, is prefix) for every term ``match_expression`` keeps."""
+    return [(word.rstrip('*'), word.endswith('*')) for word in text.split() if word.rstrip('*')]
+
+
+def _word_count(columns: Iterable[Optional[str]]) -> int:
+    """Approximate token count, from spaces (much cheaper than splitting)."""
+    return sum(value.count(' ') + 1 for value in columns if value)
+
+
+def _bm25(row: sqlite3.Row, patterns: List, idfs: List[float], average_words: float) -> float:
+    """
+    FTS5's bm25() for one candidate, computed from its text.
+
+    Term frequencies are weighted per column with ``FTS_WEIGHTS`` and the
+    length normalization uses space-separated word counts rather than
+    tokenizer counts; like bm25() the result is negated, so lower is better.
+    """
+    name, short, long = (_fold(row[key] or '') for key in ('name', 'short_description', 'description'))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * _word_count((name, short, long)) / average_words)
+    name_weight, short_weight, long_weight = FTS_WEIGHTS
+    score = 0.0
+    for pattern, idf in zip(patterns, idfs):
+        if pattern is None:
+            continue
+        frequency = (name_weight * _occurrences(pattern, name) + short_weight * _occurrences(pattern, short)
+                     + long_weight * _occurrences(pattern, long))
+        score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+    return -score
+
+
+class StartupDB:
+    """
+    Local SQLite index of scraped startups.
+
+    Startups are upserted on ``id`` with their industry and region split
+    into normalized lookup tables, and every filterable column is indexed,
+    so filtered lookups are answered from the indexes instead of reloading
+    and scanning the JSON. Name and descriptions are also kept in an FTS5
+    index for ranked full-text search. Instances are page callbacks for
+    ``scrape_startupbase_api``: each page is upserted (and indexed) in one
+    transaction as it arrives.
+    """
+
+    def __init__(self, filename: str = "startups.db"):
+        self.filename = filename
+        # Page callbacks may run on crawl threads; callers serialize access
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        fts = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'startup_fts'").fetchone()
+        if fts is not None and 'prefix=' not in fts[0]:
+            # Built before prefix indexes were added; recreated with them below
+            with self.conn:
+                self.conn.execute("DROP TABLE startup_fts")
+            fts = None
+        self.conn.executescript(FTS_SCHEMA)
+        if fts is None:
+            # Index rows upserted before the full-text table existed
+            with self.conn:
+                self.conn.execute("INSERT INTO startup_fts (startup_fts) VALUES ('rebuild')")
+        self.records_upserted = 0
+        self._corpus = None
+
+    def upsert(self, startups: Iterable[Dict]):
+        """Insert or update startups (and their industries and regions) in one transaction."""
+        industries = {}
+        regions = {}
+        rows = []
+        now = time.time()
+        for startup in startups:
+            industry = startup.get('industry') or {}
+            region = startup.get('region') or {}
+            if industry.get('id') is not None:
+                industries[industry['id']] = (industry['id'], industry.get('name') or '')
+            if region.get('id') is not None:
+                regions[region['id']] = (region['id'], region.get('name') or '', region.get('county'),
+                                         _to_float(region.get('lat')), _to_float(region.get('long')))
+            rows.append((
+                startup.get('id'), startup.get('name'), startup.get('logo'), startup.get('image'),
+                startup.get('short_description'), startup.get('description'),
+                industry.get('id'), startup.get('stage'), region.get('id'),
+                *(bool(startup.get(flag)) for flag in BOOLEAN_COLUMNS),
+                now,
+            ))
+
+        with instrumentation.phase('db_upsert'), self.conn:
+            self.conn.executemany(_UPSERT_INDUSTRY, industries.values())
+            self.conn.executemany(_UPSERT_REGION, regions.values())
+            self.conn.executemany(_UPSERT_STARTUP, rows)
+        self.records_upserted += len(rows)
+        self._corpus = None
+
+    def __call__(self, offset: int, results: List[Dict], total_count: int) -> bool:
+        self.upsert(results)
+        return False
+
+    def import_file(self, filename: str, batch_size: int = 1000) -> int:
+        """
+        Upsert every startup from a JSON, JSON Lines or compressed export.
+
+        Returns:
+            Number of startups read
+        """
+        batch = []
+        total = 0
+        for startup in iter_startups(filename):
+            batch.append(startup)
+            if len(batch) >= batch_size:
+                self.upsert(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self.upsert(batch)
+            total += len(batch)
+        return total
+
+    @staticmethod
+    def _where(industry: Optional[str] = None, stage: Optional[str] = None, region: Optional[str] = None,
+               **flags: Optional[bool]) -> Tuple[str, List]:
+        """Build a WHERE clause whose every term can use a secondary index."""
+        clauses = []
+        params: List = []
+        if industry is not None:
+            clauses.append("s.industry_id IN (SELECT id FROM industry WHERE name = ?)")
+            params.append(industry)
+        if stage is not None:
+            clauses.append("s.stage = ?")
+            params.append(stage)
+        if region is not None:
+            clauses.append("s.region_id IN (SELECT id FROM region WHERE name = ?)")
+            params.append(region)
+        for flag, value in flags.items():
+            if flag not in BOOLEAN_COLUMNS:
+                raise ValueError(f"Unknown flag: {flag}")
+            if value is not None:
+                clauses.append(f"s.{flag} = ?")
+                params.append(int(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, industry: Optional[str] = None, stage: Optional[str] = None, region: Optional[str] = None,
+              limit: Optional[int] = None, **flags: Optional[bool]) -> List[Dict]:
+        """
+        Find startups matching every given filter.
+
+        Args:
+            industry: Industry name, e.g. 'HealthTech & MedTech'
+            stage: Raw API stage code, e.g. 'seed_'
+            region: Region name, e.g. 'Tashkent'
+            limit: Maximum number of rows to return
+            **flags: Boolean filters named after ``BOOLEAN_COLUMNS``, e.g. is_verified=True
+
+        Returns:
+            List of flat startup dictionaries ordered by id
+        """
+        where, params = self._where(industry, stage, region, **flags)
+        sql = _SELECT_STARTUPS + where + " ORDER BY s.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    def _corpus_stats(self) -> Tuple[int, float]:
+        """Number of startups and average words per startup, cached until the next upsert."""
+        if self._corpus is None:
+            count = self.conn.execute("SELECT COUNT(*) FROM startup").fetchone()[0]
+            lengths = [_word_count(row) for row in self.conn.execute(
+                "SELECT name, short_description, description FROM startup ORDER BY id DESC LIMIT ?",
+                (DF_SAMPLE,))]
+            self._corpus = (count, sum(lengths) / len(lengths) if lengths else 1.0)
+        return self._corpus
+
+    def _document_frequency(self, term: str) -> float:
+        """Startups matching one FTS5 term: exact below ``DF_SAMPLE``, estimated above it."""
+        matched, oldest = self.conn.execute(
+            "SELECT COUNT(*), MIN(rowid) FROM (SELECT rowid FROM startup_fts WHERE startup_fts MATCH ? "
+            "ORDER BY rowid DESC LIMIT ?)", (term, DF_SAMPLE)).fetchone()
+        if matched < DF_SAMPLE:
+            return matched
+        # Assume the term is as common among older startups as among the newest
+        span = self.conn.execute("SELECT COUNT(*) FROM startup WHERE id >= ?", (oldest,)).fetchone()[0]
+        return matched * self._corpus_stats()[0] / max(span, 1)
+
+    def search(self, text: str, industry: Optional[str] = None, stage: Optional[str] = None,
+               region: Optional[str] = None, limit: int = 20, **flags: Optional[bool]) -> List[Dict]:
+        """
+        Full-text search over name, short_description and description.
+
+        Every whitespace-separated word in ``text`` must match (a trailing
+        ``*`` makes it a prefix) and results can be narrowed with the same
+        filters as ``query``. The newest ``RANK_WINDOW`` matches are ranked
+        by BM25 with ``FTS_WEIGHTS`` (all of them when there are fewer), so
+        a search over common words costs no more than one over rare ones.
+
+        Returns:
+            List of flat startup dictionaries, best match first, with a
+            ``score`` (lower is better) and a highlighted ``snippet``
+        """
+        expression = match_expression(text)
+        terms = expression.split(" ")
+        patterns = [_term_pattern(word, prefix) for word, prefix in _split_terms(text)]
+        where, params = self._where(industry, stage, region, **flags)
+        where = where.replace(" WHERE ", " AND ", 1)
+
+        with instrumentation.phase('db_search'):
+            # FTS5 walks posting lists in rowid order, so the newest matches come
+            # first and the walk stops after the window however many startups match
+            candidates = self.conn.execute(
+                f"{_SELECT_SEARCH_RESULTS} WHERE startup_fts MATCH ?{where} "
+                f"ORDER BY startup_fts.rowid DESC LIMIT ?",
+                [expression] + params + [RANK_WINDOW]
+            ).fetchall()
+            if not candidates:
+                return []
+
+            count, average_words = self._corpus_stats()
+            idfs = []
+            for term in terms:
+                frequency = self._document_frequency(term)
+                idfs.append(max(math.log((count - frequency + 0.5) / (frequency + 0.5)), 1e-6))
+            scored = sorted(((_bm25(row, patterns, idfs, average_words), -row['id'], row)
+                             for row in candidates), key=lambda item: item[:2])[:limit]
+
+        results = []
+        for score, _, row in scored:
+            startup = _row_to_dict(row)
+            del startup['description']
+            startup['score'] = score
+            results.append(startup)
+        return results
+
+    def count(self, industry: Optional[str] = None, stage: Optional[str] = None, region: Optional[str] = None,
+              **flags: Optional[bool]) -> int:
+        """Number of startups matching every given filter."""
+        where, params = self._where(industry, stage, region, **flags)
+        return self.conn.execute("SELECT COUNT(*) FROM startup s" + where, params).fetchone()[0]
+
+    def aggregate_frame(self):
+        """
+        Group startups by every column the ecosystem report aggregates over.
+
+        The grouping runs inside SQLite, so only one row per distinct
+        (industry, stage, region, flags) combination reaches pandas, with a
+        ``count`` column that ``compute_aggregates`` weighs rows by. Groups
+        are ordered by their lowest startup id so first-appearance tie
+        breaking matches a frame loaded record by record.
+        """
+        import pandas as pd
+
+        flags = ", ".join(f"s.{flag}" for flag in BOOLEAN_COLUMNS)
+        sql = f"""
+            SELECT i.name AS industry_name, s.stage, r.name AS region_name, {flags}, COUNT(*) AS count
+            FROM startup s
+            LEFT JOIN industry i ON i.id = s.industry_id
+            LEFT JOIN region r ON r.id = s.region_id
+            GROUP BY s.industry_id, s.stage, s.region_id, {flags}
+            ORDER BY MIN(s.id)
+        """
+        with instrumentation.phase('db_aggregate'):
+            df = pd.read_sql_query(sql, self.conn)
+        for flag in BOOLEAN_COLUMNS:
+            df[flag] = df[flag].astype(bool)
+        return df
+
+    def close(self):
+        """Refresh the planner statistics and close the connection."""
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the query tool."""
+    parser = argparse.ArgumentParser(description="Query the local SQLite index of StartupBase.uz startups")
+    parser.add_argument('database', nargs='?', default='startups.db', help="SQLite index file")
+    parser.add_argument('--import', dest='import_file', metavar='FILE',
+                        help="Upsert startups from a .json/.jsonl export before querying")
+    parser.add_argument('--search', metavar='TEXT',
+                        help="Full-text search over name and descriptions, best matches first")
+    parser.add_argument('--industry', help="Industry name, e.g. 'HealthTech & MedTech'")
+    parser.add_argument('--stage', help="Raw stage code, e.g. seed_, pre_seed, serias_a")
+    parser.add_argument('--region', help="Region name, e.g. Tashkent")
+    for flag in BOOLEAN_COLUMNS:
+        option = '--' + flag.replace('_', '-')
+        parser.add_argument(option, dest=flag, action='store_const', const=True, default=None,
+                            help=f"Only startups with {flag} set")
+    parser.add_argument('--limit', type=int, default=20, help="Maximum rows to print")
+    parser.add_argument('--count', action='store_true', help="Only print the number of matches")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Build or query the index from the command line."""
+    args = parse_args(argv)
+    with StartupDB(args.database) as db:
+        if args.import_file:
+            imported = db.import_file(args.import_file)
+            print(f"Upserted {imported} startups from {args.import_file} into {args.database}", file=sys.stderr)
+
+        filters = {flag: getattr(args, flag) for flag in BOOLEAN_COLUMNS}
+        started = time.perf_counter()
+        if args.search:
+            for row in db.search(args.search, args.industry, args.stage, args.region, limit=args.limit, **filters):
+                print(f"{row['id']:>6}  {row['name']}  [{row['industry_name'] or '-'} / "
+                      f"{row['stage'] or '-'} / {row['region_name'] or '-'}]"
+                      + f"  score {row['score']:.2f}")
+                print(f"        {row['snippet']}")
+        elif args.count:
+            print(db.count(args.industry, args.stage, args.region, **filters))
+        else:
+            for row in db.query(args.industry, args.stage, args.region, limit=args.limit, **filters):
+                print(f"{row['id']:>6}  {row['name']}  [{row['industry_name'] or '-'} / "
+                      f"{row['stage'] or '-'} / {row['region_name'] or '-'}]")
+        print(f"Query took {(time.perf_counter() - started) * 1000:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
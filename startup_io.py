@@ -0,0 +1,354 @@
+import csv
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from array import array
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional
+
+import instrumentation
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Flattened column layout shared by the CSV and Parquet exports
+FLAT_COLUMNS = [
+    'id', 'name', 'logo', 'image', 'short_description', 'description',
+    'industry_id', 'industry_name', 'stage',
+    'region_id', 'region_name', 'region_country', 'region_lat', 'region_long',
+    'is_verified', 'digital_startup_awards_participant', 'is_member', 'tech_awards_winner',
+]
+
+# Low-cardinality columns stored dictionary-encoded (pandas categoricals on load)
+CATEGORICAL_COLUMNS = ('industry_name', 'stage', 'region_name')
+
+BOOLEAN_COLUMNS = ('is_verified', 'digital_startup_awards_participant', 'is_member', 'tech_awards_winner')
+
+
+def open_text(filename: str, mode: str = 'rt', newline: Optional[str] = None) -> IO[str]:
+    """
+    Open a text file, transparently (de)compressing by extension.
+
+    ``.gz`` uses gzip and ``.zst`` uses zstandard (optional dependency);
+    anything else is opened as plain UTF-8 text. ``newline`` is passed
+    through (``''`` for the csv module).
+    """
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode, encoding='utf-8', newline=newline)
+    if filename.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("zstandard is required for .zst files: pip install zstandard")
+        return zstandard.open(filename, mode, encoding='utf-8', newline=newline)
+    return open(filename, mode.replace('t', ''), encoding='utf-8', newline=newline)
+
+
+def partial_name(filename: str) -> str:
+    """Name a file being staged for ``filename``, keeping its compression suffix last."""
+    for suffix in ('.gz', '.zst'):
+        if filename.endswith(suffix):
+            return f"{filename[:-len(suffix)]}.partial{suffix}"
+    return f"{filename}.partial"
+
+
+def is_ndjson(filename: str) -> bool:
+    """True for JSON Lines files, compressed, staged (``partial_name``) or not."""
+    for suffix in ('.gz', '.zst'):
+        if filename.endswith(suffix):
+            filename = filename[:-len(suffix)]
+    if filename.endswith('.partial'):
+        filename = filename[:-len('.partial')]
+    return filename.endswith(('.jsonl', '.ndjson'))
+
+
+def iter_startups(filename: str = "startups_data.json") -> Iterator[Dict]:
+    """
+    Yield startup records one at a time.
+
+    JSON Lines files are streamed line by line, so memory stays flat
+    regardless of catalogue size. The legacy ``startups_data.json``
+    document has to be parsed whole and is then yielded from memory.
+    """
+    with open_text(filename) as f:
+        if is_ndjson(filename):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f).get('startups', [])
+
+
+def _field(key: str) -> Callable[[Dict], object]:
+    return lambda startup: startup.get(key)
+
+
+def _nested_field(parent: str, key: str) -> Callable[[Dict], object]:
+    return lambda startup: (startup.get(parent) or {}).get(key)
+
+
+# One accessor per FLAT_COLUMNS entry, reading it straight from a raw API record
+COLUMN_ACCESSORS: Dict[str, Callable[[Dict], object]] = {
+    'id': _field('id'),
+    'name': _field('name'),
+    'logo': _field('logo'),
+    'image': _field('image'),
+    'short_description': _field('short_description'),
+    'description': _field('description'),
+    'industry_id': _nested_field('industry', 'id'),
+    'industry_name': _nested_field('industry', 'name'),
+    'stage': _field('stage'),
+    'region_id': _nested_field('region', 'id'),
+    'region_name': _nested_field('region', 'name'),
+    'region_country': _nested_field('region', 'county'),
+    'region_lat': _nested_field('region', 'lat'),
+    'region_long': _nested_field('region', 'long'),
+    'is_verified': _field('is_verified'),
+    'digital_startup_awards_participant': _field('digital_startup_awards_participant'),
+    'is_member': _field('is_member'),
+    'tech_awards_winner': _field('tech_awards_winner'),
+}
+
+
+def flatten_startup(startup: Dict) -> Dict:
+    """Flatten the nested ``industry`` and ``region`` objects of one record."""
+    return {name: get(startup) for name, get in COLUMN_ACCESSORS.items()}
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def save_to_parquet(data: Iterable[Dict], filename: str = "startups_data.parquet"):
+    """
+    Save startups as a Parquet file with the flattened CSV schema.
+
+    ``industry_name``, ``stage`` and ``region_name`` are dictionary-encoded,
+    coordinates are stored as floats and the flags as booleans.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet output: pip install pyarrow")
+
+    columns = {name: [] for name in FLAT_COLUMNS}
+    for startup in data:
+        for name, value in flatten_startup(startup).items():
+            columns[name].append(value)
+    if not columns['id']:
+        print("No data to save.")
+        return
+
+    columns['region_lat'] = [_to_float(v) for v in columns['region_lat']]
+    columns['region_long'] = [_to_float(v) for v in columns['region_long']]
+
+    arrays = {}
+    for name, values in columns.items():
+        if name in CATEGORICAL_COLUMNS:
+            arrays[name] = pa.array(values, type=pa.string()).dictionary_encode()
+        elif name in BOOLEAN_COLUMNS:
+            arrays[name] = pa.array(values, type=pa.bool_())
+        elif name in ('region_lat', 'region_long'):
+            arrays[name] = pa.array(values, type=pa.float64())
+        elif name in ('id', 'industry_id', 'region_id'):
+            arrays[name] = pa.array(values, type=pa.int64())
+        else:
+            arrays[name] = pa.array(values, type=pa.string())
+
+    with instrumentation.phase('save_parquet'):
+        pq.write_table(pa.table(arrays), filename, compression='zstd')
+    print(f"Data saved to {filename}")
+
+
+def load_flat_frame(filename: str, columns: Optional[List[str]] = None):
+    """
+    Load startups as a compact, typed pandas DataFrame with the ``FLAT_COLUMNS`` schema.
+
+    Parquet files are read column-selectively (only ``columns`` are
+    decoded). JSON and JSON Lines inputs are streamed record by record
+    into per-column arrays, so no intermediate list of rows is built:
+    ``CATEGORICAL_COLUMNS`` become categoricals coded in order of first
+    appearance, ``BOOLEAN_COLUMNS`` bool arrays (missing counts as False),
+    ids nullable integers and coordinates floats. Free-text columns are
+    only materialized when they are among ``columns``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if filename.endswith('.parquet'):
+        return pd.read_parquet(filename, columns=columns)
+
+    columns = list(FLAT_COLUMNS) if columns is None else list(columns)
+    categories = {name: {} for name in columns if name in CATEGORICAL_COLUMNS}
+    codes = {name: array('i') for name in categories}
+    flags = {name: bytearray() for name in columns if name in BOOLEAN_COLUMNS}
+    values = {name: [] for name in columns if name not in categories and name not in flags}
+
+    coded = [(COLUMN_ACCESSORS[name], lookup, codes[name]) for name, lookup in categories.items()]
+    flagged = [(COLUMN_ACCESSORS[name], column) for name, column in flags.items()]
+    plain = [(COLUMN_ACCESSORS[name], column) for name, column in values.items()]
+    for startup in iter_startups(filename):
+        for get, lookup, column in coded:
+            value = get(startup)
+            column.append(-1 if value is None else lookup.setdefault(value, len(lookup)))
+        for get, column in flagged:
+            column.append(1 if get(startup) else 0)
+        for get, column in plain:
+            column.append(get(startup))
+
+    data = {}
+    for name in columns:
+        if name in categories:
+            data[name] = pd.Categorical.from_codes(np.frombuffer(codes[name], dtype=np.int32),
+                                                   categories=list(categories[name]))
+        elif name in flags:
+            data[name] = np.frombuffer(flags[name], dtype=np.bool_)
+        elif name in ('id', 'industry_id', 'region_id'):
+            data[name] = pd.array(values[name], dtype='Int64')
+        elif name in ('region_lat', 'region_long'):
+            data[name] = np.array([_to_float(v) for v in values[name]], dtype=np.float64)
+        else:
+            data[name] = values[name]
+    return pd.DataFrame(data, columns=columns)
+
+
+class NDJSONWriter:
+    """
+    Stream pages of startups to a JSON Lines file from a background thread.
+
+    Instances are page callbacks for ``scrape_startupbase_api``: each page
+    is queued and written while the crawler waits on the next response.
+    The queue is bounded so a slow disk applies back-pressure instead of
+    buffering the whole catalogue. With ``append`` the file is extended
+    rather than truncated.
+
+    With ``staged`` the records go to ``partial_name(filename)`` instead,
+    and only ``commit()`` moves them over ``filename``, so a crawl that
+    stops short never truncates the last complete file.
+    """
+
+    _DONE = object()
+
+    def __init__(self, filename: str = "startups_data.jsonl", max_pending_pages: int = 16, append: bool = False,
+                 staged: bool = False):
+        if append and staged:
+            raise ValueError("an appending NDJSONWriter cannot be staged")
+        self.filename = filename
+        self.path = partial_name(filename) if staged else filename
+        self.records_written = 0
+        self._file = open_text(self.path, 'at' if append else 'wt')
+        self._queue = queue.Queue(maxsize=max_pending_pages)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="ndjson-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            page = self._queue.get()
+            if page is self._DONE:
+                break
+            if self._error is not None:
+                continue
+            try:
+                with instrumentation.phase('save_ndjson_page'):
+                    self._file.writelines(json.dumps(startup, ensure_ascii=False) + "\n" for startup in page)
+                self.records_written += len(page)
+            except Exception as e:
+                # Keep draining so producers never block on a full queue
+                self._error = e
+
+    def _put(self, item):
+        """Queue ``item`` without blocking forever if the writer thread has died."""
+        while True:
+            if not self._thread.is_alive():
+                raise self._error or RuntimeError(f"NDJSON writer thread for {self.path} stopped")
+            try:
+                self._queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+    def __call__(self, offset: int, results: List[Dict], total_count: int) -> bool:
+        if self._error is not None:
+            raise self._error
+        self._put(results)
+        return False
+
+    def close(self):
+        """Drain pending pages and close the file."""
+        if self._thread.is_alive():
+            self._put(self._DONE)
+            self._thread.join()
+            self._file.close()
+            print(f"Streamed {self.records_written} startups to {self.path}")
+        if self._error is not None:
+            raise self._error
+
+    def commit(self):
+        """Drain and close the file and, when staged, move it over ``filename``."""
+        self.close()
+        if self.path != self.filename:
+            os.replace(self.path, self.filename)
+            print(f"Moved {self.path} to {self.filename}")
+
+
+class CSVWriter:
+    """
+    Write pages of startups to a CSV file with the fixed ``FLAT_COLUMNS`` schema.
+
+    Instances are page callbacks for ``scrape_startupbase_api``, so rows
+    are written as pages arrive and memory stays flat. The header goes out
+    up front and the file is flushed at least every ``flush_interval``
+    seconds, so the CSV of an interrupted crawl holds every page received
+    up to the last flush. A ``.gz`` or ``.zst`` suffix compresses the output.
+
+    With ``staged`` the rows go to ``partial_name(filename)`` instead, and
+    only ``commit()`` moves them over ``filename``, so a crawl that stops
+    short never replaces the last complete export.
+    """
+
+    def __init__(self, filename: str = "startups_data.csv", flush_interval: float = 5.0, staged: bool = False):
+        self.filename = filename
+        self.path = partial_name(filename) if staged else filename
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        self._accessors = [COLUMN_ACCESSORS[name] for name in FLAT_COLUMNS]
+        self._file = open_text(self.path, 'wt', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(FLAT_COLUMNS)
+        self._last_flush = time.monotonic()
+
+    def write(self, startups: Iterable[Dict]):
+        """Append rows for ``startups``, flushing when the interval has elapsed."""
+        with instrumentation.phase('save_csv_page'):
+            before = self.records_written
+            for startup in startups:
+                self._writer.writerow([get(startup) for get in self._accessors])
+                self.records_written += 1
+            instrumentation.count('csv_rows_written', self.records_written - before)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def __call__(self, offset: int, results: List[Dict], total_count: int) -> bool:
+        self.write(results)
+        return False
+
+    def close(self):
+        """Flush and close the file."""
+        if not self._file.closed:
+            self._file.close()
+            print(f"Wrote {self.records_written} startups to {self.path}")
+
+    def commit(self):
+        """Close the file and, when staged, move it over ``filename``."""
+        self.close()
+        if self.path != self.filename:
+            os.replace(self.path, self.filename)
+            print(f"Moved {self.path} to {self.filename}")
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.stub_api import StubStartupAPI
+from benchmarks.synthetic_data import generate_startups
+from http_cache import CacheMiss, HTTPCache
+from scrape_startups import create_session, scrape_startupbase_api
+
+COUNT = 120
+LIMIT = 20
+
+
+@pytest.fixture
+def api():
+    with StubStartupAPI(list(generate_startups(COUNT)), latency=0.0) as stub:
+        yield stub
+
+
+def _crawl(api, cache, limit=LIMIT):
+    return scrape_startupbase_api(api.base_url, limit=limit, delay=0.0, session=create_session(cache=cache))
+
+
+def test_stale_entries_are_revalidated_with_the_etag(api, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'cache.db'), ttl=0.0)
+    try:
+        first = _crawl(api, cache)
+        served = api.requests_served
+        # Every entry is immediately stale, so the second crawl revalidates each page
+        second = _crawl(api, cache)
+    finally:
+        cache.close()
+
+    assert second == first
+    assert api.requests_served == 2 * served
+    assert api.not_modified_served == served
+
+
+def test_offline_replays_the_cache_and_misses_raise(api, tmp_path):
+    filename = str(tmp_path / 'cache.db')
+    cache = HTTPCache(filename)
+    try:
+        online = _crawl(api, cache)
+    finally:
+        cache.close()
+    served = api.requests_served
+
+    cache = HTTPCache(filename, offline=True)
+    try:
+        assert _crawl(api, cache) == online
+        with pytest.raises(CacheMiss):
+            create_session(cache=cache).get(api.base_url, params={'limit': LIMIT + 1, 'offset': 0})
+    finally:
+        cache.close()
+    assert api.requests_served == served
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.stub_api import StubStartupAPI
+from benchmarks.synthetic_data import generate_startups
+from scrape_startups import BROWSER_PAGE_SIZE, scrape_startupbase_api
+
+COUNT = 450
+LIMIT = 20
+LATENCY = 0.05
+MAX_RPS = 20.0
+
+
+class TimedStubAPI(StubStartupAPI):
+    """Stub API that remembers when each listing offset was requested."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.arrivals = []
+        self._arrivals_lock = threading.Lock()
+
+    def respond(self, path: str):
+        offset = int(parse_qs(urlparse(path).query).get('offset', ['0'])[0])
+        with self._arrivals_lock:
+            self.arrivals.append((time.monotonic(), offset))
+        return super().respond(path)
+
+
+@pytest.fixture
+def api():
+    with TimedStubAPI(list(generate_startups(COUNT)), latency=LATENCY) as stub:
+        yield stub
+
+
+def test_concurrent_crawl_is_complete_and_in_offset_order(api):
+    pages = []
+    startups = scrape_startupbase_api(api.base_url, limit=LIMIT, delay=0.0, workers=4, max_rps=MAX_RPS,
+                                      on_page=lambda offset, results, total: pages.append(offset))
+
+    assert [startup['id'] for startup in startups] == [startup['id'] for startup in api.startups]
+    assert pages == list(range(0, COUNT, LIMIT))
+    assert api.requests_served == len(pages)
+
+
+def test_concurrent_crawl_respects_the_rate_limit(api):
+    scrape_startupbase_api(api.base_url, limit=LIMIT, delay=0.0, workers=8, max_rps=MAX_RPS)
+
+    # The first page is fetched on its own; the rest go through the limiter
+    times = sorted(arrival for arrival, offset in api.arrivals if offset > 0)
+    assert len(times) == COUNT // LIMIT
+    # Every run of requests spans at least the limiter's spacing, give or take the jitter
+    # between a slot opening and the request reaching the server. That jitter does not
+    # accumulate, but it can swamp the gap between two neighbours, so runs of five are checked.
+    interval = 1.0 / MAX_RPS
+    jitter = interval / 2
+    for window in (5, len(times)):
+        for first, last in zip(times, times[window - 1:]):
+            assert last - first >= (window - 1) * interval - jitter
+
+
+@pytest.mark.parametrize('reject_oversized, probes', [
+    (False, 4),  # 8, 16, 32 served in full; 64 capped at 50
+    (True, 9),   # 8, 16, 32 accepted; 64 rejected; 48, 56, 52, 50, 51 binary-searched
+])
+def test_negotiated_crawl_finds_the_largest_page_size(reject_oversized, probes):
+    with StubStartupAPI(list(generate_startups(COUNT)), max_page_size=50,
+                        reject_oversized=reject_oversized) as stub:
+        pages = []
+        startups = scrape_startupbase_api(stub.base_url, delay=0.0,
+                                          on_page=lambda offset, results, total: pages.append(offset))
+
+        assert [startup['id'] for startup in startups] == [startup['id'] for startup in stub.startups]
+        assert pages == list(range(0, COUNT, 50))
+        # Offset 0 comes from the last probe, so only the other pages are fetched again
+        assert stub.requests_served == probes + len(pages) - 1
+        assert stub.requests_served < COUNT // BROWSER_PAGE_SIZE
@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_data import generate_startups
+from startup_db import RANK_WINDOW, StartupDB
+
+VOCABULARY = [f'word{i}' for i in range(200)] + ['café', 'clinic']
+
+
+def _index(count: int) -> StartupDB:
+    rng = random.Random(3)
+    startups = list(generate_startups(count))
+    for startup in startups:
+        startup['name'] = ' '.join(rng.choices(VOCABULARY, k=rng.randint(1, 3)))
+        startup['short_description'] = ' '.join(rng.choices(VOCABULARY, k=rng.randint(3, 8)))
+        startup['description'] = ' '.join(rng.choices(VOCABULARY + ['filler'] * 50, k=rng.randint(10, 60)))
+    db = StartupDB(':memory:')
+    db.upsert(startups)
+    return db
+
+
+def test_search_scores_match_fts5_bm25():
+    """Below RANK_WINDOW matches the Python ranking reproduces FTS5's bm25()."""
+    db = _index(400)
+    for text, expression in [('word5', '"word5"'), ('word17 word3', '"word17" "word3"'),
+                             ('cli*', '"cli"*'), ('cafe', '"cafe"')]:
+        matches = db.conn.execute("SELECT COUNT(*) FROM startup_fts WHERE startup_fts MATCH ?",
+                                  (expression,)).fetchone()[0]
+        assert 0 < matches <= RANK_WINDOW
+        expected = db.conn.execute(
+            "SELECT rowid, bm25(startup_fts, 10.0, 4.0, 1.0) FROM startup_fts WHERE startup_fts MATCH ? "
+            "ORDER BY 2, rowid DESC LIMIT 10", (expression,)).fetchall()
+        results = db.search(text, limit=10)
+        assert [row['id'] for row in results] == [row[0] for row in expected]
+        for result, row in zip(results, expected):
+            assert abs(result['score'] - row[1]) < 1e-6
+            assert '[' in result['snippet']
+
+
+def test_search_ranks_newest_window_with_filters():
+    db = _index(3000)
+    results = db.search('filler', region='Tashkent', limit=5)
+    assert len(results) == 5
+    assert all(row['region_name'] == 'Tashkent' for row in results)
+    assert all(isinstance(row['score'], float) for row in results)
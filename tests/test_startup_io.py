@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from startup_io import NDJSONWriter, iter_startups, partial_name
+
+
+def test_ndjson_writer_surfaces_errors_instead_of_blocking(tmp_path):
+    writer = NDJSONWriter(str(tmp_path / 'startups.jsonl'), max_pending_pages=2)
+    with pytest.raises(TypeError):
+        # Far more pages than the queue holds: a dead writer thread would block here forever
+        for _ in range(20):
+            writer(0, [{'id': 1, 'name': object()}], 20)
+    with pytest.raises(TypeError):
+        writer.close()
+
+
+def test_staged_ndjson_writer_keeps_last_file_until_commit(tmp_path):
+    filename = str(tmp_path / 'startups.jsonl')
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('{"id": 1}\n')
+    writer = NDJSONWriter(filename, staged=True)
+    writer(0, [{'id': 2}, {'id': 3}], 2)
+    writer.close()
+    assert writer.path == partial_name(filename)
+    assert [s['id'] for s in iter_startups(filename)] == [1]
+    assert [s['id'] for s in iter_startups(writer.path)] == [2, 3]
+    writer.commit()
+    assert [s['id'] for s in iter_startups(filename)] == [2, 3]
+    assert not os.path.exists(writer.path)